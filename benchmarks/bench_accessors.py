@@ -0,0 +1,91 @@
+from benchmarks.fixtures import WRITERS
+from pathlib import Path
+from rtaglib.metadata import Metadata
+from rtaglib.pos import Pos
+from tempfile import TemporaryDirectory
+from timeit import Timer
+from typing import Any, Callable, Sequence
+from uuid import uuid4
+
+
+class NullMetadata(Metadata):
+    def _get_tag(self, tag: str, default: Any = None) -> Any:
+        return default
+
+    def _set_tag(self, tag: str, value: Any) -> None:
+        pass
+
+    def _del_tag(self, tag: str) -> None:
+        pass
+
+    def _get_track_disc(self, default: Any = None) -> Any:
+        return default
+
+    def _get_track_number(self, default: Any = None) -> Any:
+        return default
+
+
+def sample_value(tag_type: type) -> object:
+    if tag_type is Pos:
+        return Pos(index=3, total=12)
+    if tag_type is str:
+        return "Title"
+    return uuid4()
+
+
+def get_all(m: Metadata, tags: Sequence[str], uncached: bool = False) -> None:
+    for tag in tags:
+        if uncached:
+            m._values.clear()
+        m.get_tag(tag, default=None)
+
+
+def get_all_properties(m: Metadata, tags: Sequence[str], uncached: bool = False) -> None:
+    for tag in tags:
+        if uncached:
+            m._values.clear()
+        getattr(m, tag)
+
+
+def set_all(m: Metadata, tags: Sequence[str]) -> None:
+    for tag in tags:
+        m.set_tag(tag, m.get_tag(tag))
+
+
+def time_ns(f: Callable[[], Any], number: int) -> float:
+    return min(Timer(f).repeat(repeat=5, number=number)) / number * 1e9
+
+
+def report(name: str, results: dict[str, float]) -> None:
+    print(f"{name:14}" + "".join(f"  {k} {v:8.0f} ns" for k, v in results.items()))
+
+
+def main() -> None:
+    number = 20000
+
+    m: Metadata = NullMetadata(m=None)
+    tags = m.tags
+    report("dispatch", {
+        "property": time_ns(lambda: get_all_properties(m, tags, uncached=True), number * 5) / len(tags),
+        "get_tag": time_ns(lambda: get_all(m, tags, uncached=True), number * 5) / len(tags),
+        "cached": time_ns(lambda: get_all(m, tags), number * 5) / len(tags),
+    })
+
+    with TemporaryDirectory() as d:
+        for ext, write in WRITERS.items():
+            m = Metadata.load(write(Path(d) / f"fixture.{ext}"))
+            for tag, tag_type, _ in m.__class__._TAGS:
+                m.set_tag(tag, sample_value(tag_type))
+
+            tags = m.tags
+            results = {
+                "property": time_ns(lambda: get_all_properties(m, tags), number) / len(tags),
+                "get_tag": time_ns(lambda: get_all(m, tags), number) / len(tags),
+                "set_tag": time_ns(lambda: set_all(m, tags), number // 10) / len(tags),
+                "snapshot": time_ns(m.snapshot, number),
+            }
+            report(m.__class__.__name__, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+from argparse import ArgumentParser
+from rtaglib.pos import Pos
+from time import perf_counter
+from typing import Callable, Sequence
+import random
+import tracemalloc
+
+
+def positions(n: int, seed: int = 0) -> Sequence[str]:
+    rng = random.Random(seed)
+    result = []
+    for _ in range(n):
+        total = rng.randint(1, 30)
+        index = rng.randint(1, total)
+        result.append(f"{index}/{total}" if rng.random() < 0.8 else str(index))
+    return result
+
+
+def measure(name: str, f: Callable[[], object], n: int) -> None:
+    start = perf_counter()
+    result = f()
+    elapsed = perf_counter() - start
+    del result
+
+    tracemalloc.start()
+    result = f()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    print(f"{name:18}  {elapsed / n * 1e9:8.0f} ns/op  retained {current / n:6.1f} B/op  peak {peak / n:6.1f} B/op")
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Measure Pos parse, construction and formatting cost")
+    parser.add_argument("-n", type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    n = args.n
+    common = positions(n)
+    rare = [f"{i % 900 + 100}/{i % 900 + 1000}" for i in range(n)]
+
+    measure("parse common", lambda: [Pos.parse(s) for s in common], n)
+    measure("parse rare", lambda: [Pos.parse(s) for s in rare], n)
+    measure("construct common", lambda: [Pos(index=i % 99 + 1, total=99) for i in range(n)], n)
+
+    parsed = [Pos.parse(s) for s in rare]
+    measure("str", lambda: [str(pos) for pos in parsed], n)
+    del parsed
+
+    tracemalloc.start()
+    for i in range(n):
+        str(Pos(index=i + 100, total=None))
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{'str retained':18}  {current:8d} B total after {n} formatted positions")
+
+
+if __name__ == "__main__":
+    main()
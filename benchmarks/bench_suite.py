@@ -0,0 +1,145 @@
+from argparse import ArgumentParser
+from benchmarks.fixtures import WRITERS, make_fixture
+from pathlib import Path
+from rtaglib.metadata import Metadata, Snapshot
+from rtaglib.pos import Pos
+from tempfile import TemporaryDirectory
+from timeit import Timer
+from typing import Any, Callable, Iterator, NamedTuple
+from uuid import UUID
+import json
+import platform
+import sys
+
+
+class Profile(NamedTuple):
+    name: str
+    audio_size: int
+    artwork_size: int
+    extra_tags: int
+
+
+PROFILES: list[Profile] = [
+    Profile(name="small", audio_size=64 * 1024, artwork_size=0, extra_tags=0),
+    Profile(name="large", audio_size=16 * 1024 * 1024, artwork_size=0, extra_tags=0),
+    Profile(name="artwork", audio_size=1024 * 1024, artwork_size=8 * 1024 * 1024, extra_tags=0),
+    Profile(name="extra-tags", audio_size=1024 * 1024, artwork_size=0, extra_tags=500),
+]
+
+SAMPLE_VALUES: dict[type, tuple[Any, Any]] = {
+    str: ("Title A", "Title B"),
+    Pos: (Pos(index=1, total=10), Pos(index=2, total=10)),
+    UUID: (UUID(int=1), UUID(int=2)),
+}
+
+
+def time_op(f: Callable[[], Any], number: int, repeat: int) -> float:
+    return min(Timer(f).repeat(repeat=repeat, number=number)) / number
+
+
+def get_uncached(m: Metadata, tag: str) -> Any:
+    m._values.clear()
+    return m.get_tag(tag)
+
+
+def snapshot_uncached(m: Metadata) -> Snapshot:
+    m._values.clear()
+    return m.snapshot()
+
+
+def swap_tag(m: Metadata, tag: str, a: Any, b: Any) -> None:
+    m.set_tag(tag, b)
+    m.set_tag(tag, a)
+
+
+def save_title(m: Metadata, values: Iterator[int]) -> None:
+    m.set_tag("track_title", f"Title {next(values)}")
+    m.save()
+
+
+def bench_file(path: Path, number: int, repeat: int) -> dict[str, Any]:
+    Metadata.load(path)
+    Metadata.load(path, tags_only=True)
+    results: dict[str, Any] = {
+        "file_size": path.stat().st_size,
+        "load": time_op(lambda: Metadata.load(path), number, repeat),
+        "load_tags_only": time_op(lambda: Metadata.load(path, tags_only=True), number, repeat),
+    }
+
+    m = Metadata.load(path)
+    for tag, tag_type, _ in m.__class__._TAGS:
+        m.set_tag(tag, SAMPLE_VALUES[tag_type][0])
+    m.save()
+
+    get_tag: dict[str, float] = {}
+    get_tag_cached: dict[str, float] = {}
+    set_tag: dict[str, float] = {}
+    for tag, tag_type, _ in m.__class__._TAGS:
+        a, b = SAMPLE_VALUES[tag_type]
+        get_tag[tag] = time_op(lambda: get_uncached(m, tag), number * 100, repeat)
+        get_tag_cached[tag] = time_op(lambda: m.get_tag(tag), number * 100, repeat)
+        set_tag[tag] = time_op(lambda: swap_tag(m, tag, a, b), number * 50, repeat) / 2
+    results["get_tag"] = get_tag
+    results["get_tag_cached"] = get_tag_cached
+    results["set_tag"] = set_tag
+    results["snapshot"] = time_op(lambda: snapshot_uncached(m), number * 10, repeat)
+    results["snapshot_cached"] = time_op(m.snapshot, number * 10, repeat)
+
+    values = iter(range(sys.maxsize))
+    results["save"] = time_op(lambda: save_title(m, values), number, repeat)
+    return results
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Benchmark rtaglib against synthetic fixtures")
+    parser.add_argument("--number", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--formats", nargs="*", default=list(WRITERS))
+    parser.add_argument("--profiles", nargs="*", default=[p.name for p in PROFILES])
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    import mutagen
+    report: dict[str, Any] = {
+        "python": platform.python_version(),
+        "mutagen": mutagen.version_string,
+        "results": [],
+    }
+    with TemporaryDirectory() as d:
+        for profile in PROFILES:
+            if profile.name not in args.profiles:
+                continue
+            for ext in args.formats:
+                path = make_fixture(
+                    Path(d),
+                    ext,
+                    audio_size=profile.audio_size,
+                    artwork_size=profile.artwork_size,
+                    extra_tags=profile.extra_tags)
+                result = bench_file(path, number=args.number, repeat=args.repeat)
+                report["results"].append({
+                    "format": ext,
+                    "profile": profile.name,
+                    "audio_size": profile.audio_size,
+                    "artwork_size": profile.artwork_size,
+                    "extra_tags": profile.extra_tags,
+                    **result,
+                })
+                print(
+                    f"{ext:5} {profile.name:10} "
+                    f"load {result['load'] * 1e6:9.0f} us  "
+                    f"tags-only {result['load_tags_only'] * 1e6:9.0f} us  "
+                    f"snapshot {result['snapshot'] * 1e6:7.1f} us  "
+                    f"cached {result['snapshot_cached'] * 1e6:7.1f} us  "
+                    f"save {result['save'] * 1e6:9.0f} us",
+                    file=sys.stderr)
+
+    output = json.dumps(report, indent=2)
+    if args.output is None:
+        print(output)
+    else:
+        args.output.write_text(output)
+
+
+if __name__ == "__main__":
+    main()
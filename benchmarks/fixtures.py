@@ -0,0 +1,113 @@
+from pathlib import Path
+import struct
+
+
+ASF_HEADER_GUID = bytes.fromhex("3026B2758E66CF11A6D900AA0062CE6C")
+ASF_DATA_GUID = bytes.fromhex("3626B2758E66CF11A6D900AA0062CE6C")
+
+
+def _atom(name: bytes, data: bytes) -> bytes:
+    return struct.pack(">I4s", 8 + len(data), name) + data
+
+
+def _flac_block(code: int, data: bytes, last: bool = False) -> bytes:
+    return bytes([code | (0x80 if last else 0)]) + len(data).to_bytes(3, "big") + data
+
+
+def write_flac(path: Path, audio_size: int = 4096) -> Path:
+    stream_info = \
+        struct.pack(">HH", 4096, 4096) + \
+        b"\0\0\0\0\0\0" + \
+        bytes([0x0A, 0xC4, 0x42, 0xF0]) + \
+        b"\0" * 20
+    vendor = b"rtaglib"
+    vorbis_comment = struct.pack("<I", len(vendor)) + vendor + struct.pack("<I", 0)
+    path.write_bytes(
+        b"fLaC" +
+        _flac_block(0, stream_info) +
+        _flac_block(4, vorbis_comment, last=True) +
+        b"\xff\xf8" + b"\0" * audio_size)
+    return path
+
+
+def write_mp3(path: Path, audio_size: int = 4096) -> Path:
+    frame = b"\xff\xfb\x90\x64" + b"\0" * 413
+    path.write_bytes(frame * max(1, audio_size // len(frame)))
+    return path
+
+
+def write_mp4(path: Path, audio_size: int = 4096) -> Path:
+    mvhd = _atom(b"mvhd", b"\0" * 12 + struct.pack(">II", 1000, 0) + b"\0" * 80)
+    path.write_bytes(
+        _atom(b"ftyp", b"M4A \0\0\0\0M4A mp42isom") +
+        _atom(b"moov", mvhd) +
+        _atom(b"mdat", b"\x01" * audio_size))
+    return path
+
+
+def write_asf(path: Path, audio_size: int = 4096) -> Path:
+    path.write_bytes(
+        ASF_HEADER_GUID + struct.pack("<QLBB", 30, 0, 1, 2) +
+        ASF_DATA_GUID + struct.pack("<Q", 24 + 26 + audio_size) + b"\0" * 26 +
+        b"\x02" * audio_size)
+    return path
+
+
+WRITERS = {
+    "flac": write_flac,
+    "mp3": write_mp3,
+    "m4a": write_mp4,
+    "wma": write_asf,
+}
+
+
+def decorate(path: Path, artwork_size: int = 0, extra_tags: int = 0) -> Path:
+    import mutagen
+    from mutagen.asf import ASF, ASFByteArrayAttribute
+    from mutagen.flac import FLAC, Picture
+    from mutagen.id3 import APIC, TXXX
+    from mutagen.mp3 import MP3
+    from mutagen.mp4 import MP4, MP4Cover, MP4FreeForm
+
+    artwork = bytes(i & 0xFF for i in range(artwork_size))
+    m = mutagen.File(path)
+    if m.tags is None:
+        m.add_tags()
+        assert m.tags is not None
+
+    match m:
+        case FLAC():
+            if artwork:
+                picture = Picture()
+                picture.type = 3
+                picture.mime = "image/jpeg"
+                picture.data = artwork
+                m.add_picture(picture)
+            for i in range(extra_tags):
+                m.tags[f"extra_{i}"] = f"value {i}"
+        case MP3():
+            if artwork:
+                m.tags.add(APIC(encoding=3, mime="image/jpeg", type=3, desc="Cover", data=artwork))
+            for i in range(extra_tags):
+                m.tags.add(TXXX(encoding=3, desc=f"Extra {i}", text=f"value {i}"))
+        case MP4():
+            if artwork:
+                m.tags["covr"] = [MP4Cover(artwork)]
+            for i in range(extra_tags):
+                m.tags[f"----:org.example:Extra{i}"] = [MP4FreeForm(f"value {i}".encode())]
+        case ASF():
+            if artwork:
+                m.tags["Artwork"] = [ASFByteArrayAttribute(artwork)]
+            for i in range(extra_tags):
+                m.tags[f"Extra{i}"] = f"value {i}"
+
+    m.save()
+    return path
+
+
+def make_fixture(directory: Path, ext: str, audio_size: int = 4096, artwork_size: int = 0, extra_tags: int = 0) -> Path:
+    path = directory / f"{audio_size}-{artwork_size}-{extra_tags}.{ext}"
+    WRITERS[ext](path, audio_size=audio_size)
+    if artwork_size or extra_tags:
+        decorate(path, artwork_size=artwork_size, extra_tags=extra_tags)
+    return path
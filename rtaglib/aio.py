@@ -0,0 +1,45 @@
+from pathlib import Path
+from rtaglib.metadata import Metadata
+from rtaglib.padding import SaveResult
+from typing import AsyncIterator, Awaitable, Callable, Iterable, Tuple, TypeVar
+import asyncio
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+async def _bounded(items: Iterable[T], f: Callable[[T], Awaitable[R]], limit: int) -> AsyncIterator[Tuple[T, R | Exception]]:
+    async def run(item: T) -> Tuple[T, R | Exception]:
+        try:
+            return item, await f(item)
+        except Exception as e:
+            return item, e
+
+    pending: set[asyncio.Task] = set()
+    try:
+        for item in items:
+            pending.add(asyncio.create_task(run(item)))
+            if len(pending) >= limit:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def aload_all(paths: Iterable[Path], limit: int = 8, tags_only: bool = False, lazy: bool = False) -> AsyncIterator[Tuple[Path, Metadata | Exception]]:
+    return _bounded(
+        paths,
+        lambda path: Metadata.aload(path, tags_only=tags_only, lazy=lazy),
+        limit=limit)
+
+
+def asave_all(items: Iterable[Metadata], limit: int = 8) -> AsyncIterator[Tuple[Metadata, SaveResult | Exception]]:
+    return _bounded(items, lambda m: m.asave(), limit=limit)
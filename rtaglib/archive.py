@@ -0,0 +1,55 @@
+from pathlib import Path, PurePosixPath
+from rtaglib.metadata import Metadata
+from rtaglib.registry import formats
+from typing import BinaryIO, Iterator, Tuple, cast
+import tarfile
+import zipfile
+
+
+SEEK_CHUNK_SIZE = 1 << 16
+
+
+def iter_archive(path: Path, tags_only: bool = True, lazy: bool = True) -> Iterator[Tuple[str, Metadata | Exception]]:
+    if zipfile.is_zipfile(path):
+        yield from _iter_zip(path, tags_only=tags_only, lazy=lazy)
+    elif tarfile.is_tarfile(path):
+        yield from _iter_tar(path, tags_only=tags_only, lazy=lazy)
+    else:
+        raise NotImplementedError(f"Unsupported archive format in file {path}")
+
+
+def _is_supported(name: str) -> bool:
+    ext = PurePosixPath(name).suffix.lower()
+    return any(ext in format.extensions for format in formats())
+
+
+def _load(f: BinaryIO, name: str, tags_only: bool, lazy: bool) -> Metadata | Exception:
+    try:
+        return Metadata.load(f, tags_only=tags_only, lazy=lazy, name=name)
+    except Exception as e:
+        return e
+
+
+def _iter_zip(path: Path, tags_only: bool, lazy: bool) -> Iterator[Tuple[str, Metadata | Exception]]:
+    with zipfile.ZipFile(path) as z:
+        for info in z.infolist():
+            if info.is_dir() or not _is_supported(info.filename):
+                continue
+            with z.open(info) as member:
+                if isinstance(member, zipfile.ZipExtFile):
+                    member.MAX_SEEK_READ = SEEK_CHUNK_SIZE
+                f = cast(BinaryIO, member)
+                yield info.filename, _load(f, info.filename, tags_only=tags_only, lazy=lazy)
+
+
+def _iter_tar(path: Path, tags_only: bool, lazy: bool) -> Iterator[Tuple[str, Metadata | Exception]]:
+    with tarfile.open(path) as tar:
+        for info in tar:
+            if not info.isfile() or not _is_supported(info.name):
+                continue
+            member = tar.extractfile(info)
+            if member is None:
+                continue
+            with member:
+                f = cast(BinaryIO, member)
+                yield info.name, _load(f, info.name, tags_only=tags_only, lazy=lazy)
@@ -0,0 +1,94 @@
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextvars import copy_context
+from dataclasses import dataclass
+from rtaglib.journal import _fsync_dir, _fsync_file
+from rtaglib.metadata import Metadata
+from rtaglib.padding import SaveResult
+from time import perf_counter
+from typing import Callable, Iterable, Iterator, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from rtaglib.index import TagIndex
+
+
+@dataclass(frozen=True)
+class Progress:
+    done: int
+    total: int
+    errors: int
+    bytes_moved: int
+    elapsed: float
+
+    @property
+    def rate(self) -> float:
+        return self.done / self.elapsed if self.elapsed > 0 else 0.0
+
+
+ProgressCallback = Callable[[Progress], None]
+
+
+def locality_key(metadata: Metadata) -> Tuple[str, int]:
+    path = metadata.path
+    try:
+        inode = path.stat().st_ino
+    except OSError:
+        inode = 0
+    return str(path.parent), inode
+
+
+def _save(metadata: Metadata, fsync: bool) -> SaveResult:
+    result = metadata.save()
+    if fsync and result.written:
+        _fsync_file(metadata.path)
+    return result
+
+
+def save_all(items: Iterable[Metadata], workers: int = 4, fsync: bool = True, index: "TagIndex | None" = None, progress: ProgressCallback | None = None) -> Iterator[Tuple[Metadata, SaveResult | Exception]]:
+    ordered = sorted((m for m in items if m.dirty), key=locality_key)
+    remaining = Counter(m.path.parent for m in ordered)
+    start = perf_counter()
+    done = 0
+    errors = 0
+    bytes_moved = 0
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending: dict[Future, Metadata] = {}
+        items_left = iter(ordered)
+        while True:
+            for m in items_left:
+                pending[executor.submit(copy_context().run, _save, m, fsync)] = m
+                if len(pending) >= workers:
+                    break
+            if not pending:
+                break
+
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                m = pending.pop(future)
+                result: SaveResult | Exception
+                try:
+                    saved = future.result()
+                except Exception as e:
+                    result = e
+                    errors += 1
+                else:
+                    result = saved
+                    bytes_moved += saved.bytes_moved
+                    if index is not None:
+                        index.update(path=m.path, metadata=m)
+
+                parent = m.path.parent
+                remaining[parent] -= 1
+                if remaining[parent] == 0 and fsync:
+                    _fsync_dir(parent)
+
+                done += 1
+                if progress is not None:
+                    progress(Progress(
+                        done=done,
+                        total=len(ordered),
+                        errors=errors,
+                        bytes_moved=bytes_moved,
+                        elapsed=perf_counter() - start))
+                yield m, result
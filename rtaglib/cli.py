@@ -0,0 +1,246 @@
+from argparse import ArgumentParser, Namespace
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Mapping, Sequence, TextIO
+import json
+import sys
+
+
+Record = dict[str, Any]
+
+
+def _format(value: Any) -> str | None:
+    return None if value is None else str(value)
+
+
+def _read_paths(files: Sequence[str], null: bool) -> Iterator[Path]:
+    if files and files != ["-"]:
+        for file in files:
+            yield Path(file)
+        return
+
+    if null:
+        rest = b""
+        while chunk := sys.stdin.buffer.read(1 << 16):
+            *names, rest = (rest + chunk).split(b"\0")
+            for name in names:
+                if name:
+                    yield Path(name.decode(errors="surrogateescape"))
+        if rest:
+            yield Path(rest.decode(errors="surrogateescape"))
+    else:
+        for line in sys.stdin:
+            line = line.rstrip("\n")
+            if line:
+                yield Path(line)
+
+
+def _walk(roots: Sequence[str]) -> Iterator[Path]:
+    from rtaglib.scan import walk
+    for root in roots:
+        yield from walk(Path(root))
+
+
+def _get(path: Path, tags: Sequence[str]) -> Record:
+    from rtaglib.metadata import Metadata
+    m = Metadata.load(path, tags_only=True, lazy=True)
+    return {tag: _format(m.get_tag(tag, default=None)) for tag in tags}
+
+
+def _set(path: Path, values: Mapping[str, Any]) -> Record:
+    from rtaglib.metadata import Metadata
+    m = Metadata.load(path, tags_only=True, lazy=True)
+    for tag, value in values.items():
+        m.set_tag(tag, value)
+    return _save(m)
+
+
+def _del(path: Path, tags: Sequence[str]) -> Record:
+    from rtaglib.metadata import Metadata
+    m = Metadata.load(path, tags_only=True, lazy=True)
+    for tag in tags:
+        m.del_tag(tag)
+    return _save(m)
+
+
+def _save(m: Any) -> Record:
+    changes = {tag: [_format(change.old), _format(change.new)] for tag, change in m.changes().items()}
+    result = m.save()
+    return {"written": result.written, "changes": changes}
+
+
+def _run(f: Callable[[Path], Record], path: Path) -> Record:
+    try:
+        return f(path)
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _execute(paths: Iterable[Path], f: Callable[[Path], Record], jobs: int, out: TextIO) -> int:
+    g = partial(_run, f)
+    if jobs == 1:
+        results: Iterable[tuple[Path, Record]] = ((path, g(path)) for path in paths)
+    else:
+        from rtaglib.scan import map_paths
+        results = map_paths(paths, g, workers=jobs or None)
+
+    errors = 0
+    for path, record in results:
+        if "error" in record:
+            errors += 1
+        out.write(json.dumps({"path": str(path), **record}))
+        out.write("\n")
+    return 1 if errors else 0
+
+
+def _lint(roots: Sequence[str], jobs: int, out: TextIO) -> int:
+    from rtaglib.lint import iter_issues
+    issues = 0
+    for root in roots:
+        for issue in iter_issues(Path(root), workers=jobs or None):
+            issues += 1
+            out.write(json.dumps(issue.to_dict()))
+            out.write("\n")
+    return 1 if issues else 0
+
+
+def _index(roots: Sequence[str], output: str, shard: tuple[int, int] | None, jobs: int, out: TextIO) -> int:
+    from rtaglib.index import TagIndex
+    with TagIndex(Path(output)) as index:
+        for root in roots:
+            result = index.refresh(Path(root), workers=jobs or None, shard=shard)
+            out.write(json.dumps({
+                "root": root,
+                "unchanged": result.unchanged,
+                "updated": result.updated,
+                "removed": result.removed,
+            }))
+            out.write("\n")
+    return 0
+
+
+def _merge(parts: Sequence[str], output: str, out: TextIO) -> int:
+    from rtaglib.index import TagIndex
+    with TagIndex(Path(output)) as index:
+        for part in parts:
+            result = index.merge(Path(part))
+            out.write(json.dumps({"part": part, "merged": result.merged, "skipped": result.skipped}))
+            out.write("\n")
+    return 0
+
+
+def _parse_shard(parser: ArgumentParser, s: str | None) -> tuple[int, int] | None:
+    if s is None:
+        return None
+    index_str, sep, count_str = s.partition("/")
+    try:
+        shard = int(index_str), int(count_str)
+    except ValueError:
+        parser.error(f"Expected K/N, got {s}")
+    if not sep or not 0 <= shard[0] < shard[1]:
+        parser.error(f"Invalid shard {s}")
+    return shard
+
+
+def _check_tags(parser: ArgumentParser, tags: Sequence[str]) -> None:
+    from rtaglib.metadata import MetadataMeta
+    for tag in tags:
+        if tag not in MetadataMeta._TO_TAG_INFOS:
+            parser.error(f"Unknown tag {tag}")
+
+
+def _parse_assignments(parser: ArgumentParser, assignments: Sequence[str]) -> dict[str, Any]:
+    from rtaglib.metadata import MetadataMeta
+    from rtaglib.pos import Pos
+    from uuid import UUID
+
+    decoders: dict[type, Callable[[str], Any]] = {
+        str: str,
+        Pos: Pos.parse,
+        UUID: UUID,
+    }
+    values = {}
+    for assignment in assignments:
+        tag, sep, s = assignment.partition("=")
+        if not sep:
+            parser.error(f"Expected TAG=VALUE, got {assignment}")
+        _check_tags(parser, [tag])
+        try:
+            values[tag] = decoders[MetadataMeta._TO_TAG_INFOS[tag][0]](s)
+        except ValueError as e:
+            parser.error(f"Invalid value for {tag}: {e}")
+    return values
+
+
+def _make_parser() -> ArgumentParser:
+    parser = ArgumentParser(prog="rtaglib", description="Read and write canonical tags")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="number of parallel workers (0 for one per CPU)")
+    parser.add_argument("-0", "--null", action="store_true", help="file names read from stdin are NUL-separated")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    p = subparsers.add_parser("dump", help="print all canonical tags")
+    p.add_argument("files", nargs="*", help="files to read (default: read names from stdin)")
+
+    p = subparsers.add_parser("get", help="print selected tags")
+    p.add_argument("-t", "--tag", dest="tags", action="append", required=True, help="tag to print")
+    p.add_argument("files", nargs="*", help="files to read (default: read names from stdin)")
+
+    p = subparsers.add_parser("set", help="set tags")
+    p.add_argument("-t", "--tag", dest="tags", action="append", required=True, metavar="TAG=VALUE", help="tag assignment")
+    p.add_argument("files", nargs="*", help="files to update (default: read names from stdin)")
+
+    p = subparsers.add_parser("del", help="delete tags")
+    p.add_argument("-t", "--tag", dest="tags", action="append", required=True, help="tag to delete")
+    p.add_argument("files", nargs="*", help="files to update (default: read names from stdin)")
+
+    p = subparsers.add_parser("scan", help="print all canonical tags for every file under a directory")
+    p.add_argument("roots", nargs="+", help="directories to scan")
+
+    p = subparsers.add_parser("index", help="build or refresh a tag index for one or more directories")
+    p.add_argument("-o", "--output", required=True, help="index database to create or update")
+    p.add_argument("--shard", metavar="K/N", help="only index files in shard K of N (0 <= K < N)")
+    p.add_argument("roots", nargs="+", help="directories to index")
+
+    p = subparsers.add_parser("merge", help="merge partial indexes, keeping the newest entry for each file")
+    p.add_argument("-o", "--output", required=True, help="index database to merge into")
+    p.add_argument("parts", nargs="+", help="partial indexes to merge")
+
+    p = subparsers.add_parser("lint", help="check every file and album under a directory for tag problems")
+    p.add_argument("roots", nargs="+", help="directories to check")
+
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = _make_parser()
+    args: Namespace = parser.parse_args(argv)
+
+    f: Callable[[Path], Record]
+    match args.command:
+        case "lint":
+            return _lint(args.roots, jobs=args.jobs, out=sys.stdout)
+        case "index":
+            shard = _parse_shard(parser, args.shard)
+            return _index(args.roots, output=args.output, shard=shard, jobs=args.jobs, out=sys.stdout)
+        case "merge":
+            return _merge(args.parts, output=args.output, out=sys.stdout)
+        case "dump" | "scan":
+            from rtaglib.metadata import MetadataMeta
+            f = partial(_get, tags=[tag for tag, _, _ in MetadataMeta._TAGS])
+        case "get":
+            _check_tags(parser, args.tags)
+            f = partial(_get, tags=args.tags)
+        case "set":
+            f = partial(_set, values=_parse_assignments(parser, args.tags))
+        case "del":
+            _check_tags(parser, args.tags)
+            f = partial(_del, tags=args.tags)
+        case _:
+            raise NotImplementedError()
+
+    paths = _walk(args.roots) if args.command == "scan" else _read_paths(args.files, args.null)
+    return _execute(paths, f, jobs=args.jobs, out=sys.stdout)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+from os import fstat
+from pathlib import Path
+from rtaglib.registry import ASF_HEADER_GUID, _id3_size, _is_mpeg_sync
+from typing import BinaryIO, Sequence, Tuple
+import hashlib
+import struct
+
+
+ASF_DATA_GUID = bytes.fromhex("3626B2758E66CF11A6D900AA0062CE6C")
+ASF_DATA_HEADER_SIZE = 50
+CHUNK_SIZE = 1 << 20
+
+Range = Tuple[int, int]
+
+
+def audio_digest(path: Path, algorithm: str = "sha256", chunk_size: int = CHUNK_SIZE) -> str:
+    h = hashlib.new(algorithm)
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(path, "rb") as f:
+        for start, end in audio_ranges(f):
+            f.seek(start)
+            remaining = end - start
+            while remaining > 0:
+                n = f.readinto(view[:min(remaining, chunk_size)])
+                if not n:
+                    raise ValueError(f"Unexpected end of file in {path}")
+                h.update(view[:n])
+                remaining -= n
+    return h.hexdigest()
+
+
+def audio_ranges(f: BinaryIO) -> Sequence[Range]:
+    size = fstat(f.fileno()).st_size
+    f.seek(0)
+    header = f.read(16)
+    if header[4:8] == b"ftyp":
+        return _mp4_ranges(f, size)
+    if header == ASF_HEADER_GUID:
+        return _asf_ranges(f, size)
+
+    start = 0
+    while header[:3] == b"ID3" and len(header) >= 10:
+        start += _id3_size(header)
+        f.seek(start)
+        header = f.read(10)
+    if header[:4] == b"fLaC":
+        return [(_flac_audio_offset(f, start + 4), size)]
+    if _is_mpeg_sync(header) or start > 0:
+        return [(start, _mp3_audio_end(f, start, size))]
+    raise NotImplementedError(f"Unsupported file type in {f.name}")
+
+
+def _flac_audio_offset(f: BinaryIO, offset: int) -> int:
+    while True:
+        f.seek(offset)
+        block_header = f.read(4)
+        if len(block_header) < 4:
+            raise ValueError(f"Truncated FLAC metadata in {f.name}")
+        offset += 4 + int.from_bytes(block_header[1:4], "big")
+        if block_header[0] & 0x80:
+            return offset
+
+
+def _mp3_audio_end(f: BinaryIO, start: int, end: int) -> int:
+    while end - start >= 32:
+        f.seek(end - 128 if end - start >= 128 else end - 32)
+        tail = f.read(end - f.tell())
+        if len(tail) >= 128 and tail[-128:-125] == b"TAG":
+            end -= 128
+        elif tail[-32:-24] == b"APETAGEX":
+            size, _, flags = struct.unpack("<III", tail[-20:-8])
+            end -= size + (32 if flags & 0x80000000 else 0)
+        elif tail[-9:] == b"LYRICS200" and tail[-15:-9].isdigit():
+            end -= int(tail[-15:-9]) + 15
+        else:
+            break
+    return max(start, end)
+
+
+def _mp4_ranges(f: BinaryIO, size: int) -> Sequence[Range]:
+    ranges = []
+    offset = 0
+    while offset + 8 <= size:
+        f.seek(offset)
+        atom_size, name = struct.unpack(">I4s", f.read(8))
+        header_size = 8
+        if atom_size == 1:
+            atom_size, = struct.unpack(">Q", f.read(8))
+            header_size = 16
+        elif atom_size == 0:
+            atom_size = size - offset
+        if atom_size < header_size:
+            raise ValueError(f"Invalid atom size {atom_size} at offset {offset} in {f.name}")
+        if name == b"mdat":
+            ranges.append((offset + header_size, min(offset + atom_size, size)))
+        offset += atom_size
+    return ranges
+
+
+def _asf_ranges(f: BinaryIO, size: int) -> Sequence[Range]:
+    f.seek(16)
+    offset, = struct.unpack("<Q", f.read(8))
+    while offset + 24 <= size:
+        f.seek(offset)
+        guid = f.read(16)
+        object_size, = struct.unpack("<Q", f.read(8))
+        if guid == ASF_DATA_GUID:
+            return [(offset + ASF_DATA_HEADER_SIZE, min(offset + object_size, size))]
+        if object_size < 24:
+            break
+        offset += object_size
+    raise ValueError(f"No ASF data object in {f.name}")
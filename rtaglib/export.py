@@ -0,0 +1,124 @@
+from array import array
+from pathlib import Path
+from rtaglib.metadata import Metadata, MetadataMeta, Snapshot
+from rtaglib.pos import Pos
+from typing import Any, Iterable, Iterator, TextIO, Tuple
+from uuid import UUID
+import csv
+import json
+
+
+NIL_UUID_BYTES = bytes(16)
+NO_POS = -1
+
+
+def snapshots(items: Iterable[Metadata | Path], tags_only: bool = True) -> Iterator[Tuple[Path, Snapshot | Exception]]:
+    for item in items:
+        path = item.path if isinstance(item, Metadata) else item
+        yield path, _snapshot(item, tags_only=tags_only)
+
+
+def _snapshot(item: Metadata | Path, tags_only: bool) -> Snapshot | Exception:
+    try:
+        m = item if isinstance(item, Metadata) else Metadata.load(item, tags_only=tags_only)
+        return m.snapshot()
+    except Exception as e:
+        return e
+
+
+def write_jsonl(items: Iterable[Metadata | Path], f: TextIO, tags_only: bool = True) -> int:
+    count = 0
+    for path, snapshot in snapshots(items, tags_only=tags_only):
+        record: dict[str, Any] = {"path": str(path)}
+        if isinstance(snapshot, Exception):
+            record["error"] = str(snapshot)
+        else:
+            for tag, value in zip(Snapshot._fields, snapshot):
+                record[tag] = None if value is None else str(value)
+        f.write(json.dumps(record))
+        f.write("\n")
+        count += 1
+    return count
+
+
+def write_csv(items: Iterable[Metadata | Path], f: TextIO, tags_only: bool = True) -> int:
+    writer = csv.writer(f)
+    writer.writerow(["path", *Snapshot._fields, "error"])
+    count = 0
+    for path, snapshot in snapshots(items, tags_only=tags_only):
+        if isinstance(snapshot, Exception):
+            writer.writerow([str(path), *("" for _ in Snapshot._fields), str(snapshot)])
+        else:
+            writer.writerow([str(path), *("" if value is None else str(value) for value in snapshot), ""])
+        count += 1
+    return count
+
+
+class ColumnarTable:
+    def __init__(self) -> None:
+        self.paths: list[str] = []
+        self.strs: dict[str, list[str | None]] = {}
+        self.pos_indices: dict[str, array] = {}
+        self.pos_totals: dict[str, array] = {}
+        self.uuids: dict[str, bytearray] = {}
+        for tag, tag_type, _ in MetadataMeta._TAGS:
+            if tag_type is Pos:
+                self.pos_indices[tag] = array("i")
+                self.pos_totals[tag] = array("i")
+            elif tag_type is UUID:
+                self.uuids[tag] = bytearray()
+            else:
+                self.strs[tag] = []
+
+    @classmethod
+    def build(cls, items: Iterable[Metadata | Path], tags_only: bool = True) -> "ColumnarTable":
+        table = cls()
+        for path, snapshot in snapshots(items, tags_only=tags_only):
+            if not isinstance(snapshot, Exception):
+                table.append(path, snapshot)
+        return table
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def append(self, path: Path, snapshot: Snapshot) -> None:
+        self.paths.append(str(path))
+        for tag, value in zip(Snapshot._fields, snapshot):
+            if tag in self.uuids:
+                self.uuids[tag] += value.bytes if isinstance(value, UUID) else NIL_UUID_BYTES
+            elif tag in self.pos_indices:
+                pos = value if isinstance(value, Pos) else None
+                self.pos_indices[tag].append(NO_POS if pos is None or pos.index is None else pos.index)
+                self.pos_totals[tag].append(NO_POS if pos is None or pos.total is None else pos.total)
+            else:
+                self.strs[tag].append(value if isinstance(value, str) else None)
+
+    def uuid(self, tag: str, i: int) -> UUID | None:
+        b = bytes(self.uuids[tag][i * 16:(i + 1) * 16])
+        return None if b == NIL_UUID_BYTES else UUID(bytes=b)
+
+    def pos(self, tag: str, i: int) -> Pos | None:
+        index = self.pos_indices[tag][i]
+        total = self.pos_totals[tag][i]
+        if index == NO_POS and total == NO_POS:
+            return None
+        return Pos(
+            index=None if index == NO_POS else index,
+            total=None if total == NO_POS else total)
+
+    def row(self, i: int) -> Tuple[Path, Snapshot]:
+        return Path(self.paths[i]), Snapshot._make([
+            self.uuid(tag, i) if tag in self.uuids
+            else self.pos(tag, i) if tag in self.pos_indices
+            else self.strs[tag][i]
+            for tag in Snapshot._fields
+        ])
+
+    def group_by(self, tag: str) -> dict[bytes, list[int]]:
+        data = self.uuids[tag]
+        groups: dict[bytes, list[int]] = {}
+        for i in range(len(self.paths)):
+            key = bytes(data[i * 16:(i + 1) * 16])
+            if key != NIL_UUID_BYTES:
+                groups.setdefault(key, []).append(i)
+        return groups
@@ -1,7 +1,11 @@
 from dataclasses import MISSING, dataclass
+from mutagen.flac import FLAC, Picture
+from rtaglib.lazy import LazyFileType, LazyPayload
 from rtaglib.metadata import \
     ALBUM_TITLE_ATTR, \
     ARTIST_TITLE_ATTR, \
+    TRACK_DISC_ATTR, \
+    TRACK_NUMBER_ATTR, \
     TRACK_TITLE_ATTR, \
     MUSICBRAINZ_ALBUM_ID_ATTR, \
     MUSICBRAINZ_ARTIST_ID_ATTR, \
@@ -11,7 +15,40 @@ from rtaglib.metadata import \
     RCOOK_TRACK_ID_ATTR, \
     Metadata
 from rtaglib.pos import Pos
-from typing import Any, Sequence, Tuple
+from typing import Any, Iterator, Mapping, Sequence, Tuple
+import struct
+
+
+class LazyPicture(Picture):
+    def load(self, data: Any) -> None:
+        self.type, length = struct.unpack(">2I", data.read(8))
+        self.mime = data.read(length).decode("UTF-8", "replace")
+        length, = struct.unpack(">I", data.read(4))
+        self.desc = data.read(length).decode("UTF-8", "replace")
+        self.width, self.height, self.depth, self.colors, length = struct.unpack(">5I", data.read(20))
+        self.data = LazyPayload(offset=data.tell(), length=length)
+        data.seek(length, 1)
+
+    def write(self) -> bytes:
+        data = self.data
+        if isinstance(data, LazyPayload):
+            self.data = data.read()
+        try:
+            return super().write()
+        finally:
+            self.data = data
+
+
+class LazyFLAC(LazyFileType, FLAC):
+    METADATA_BLOCKS = [
+        LazyPicture if block_type is Picture else block_type
+        for block_type in FLAC.METADATA_BLOCKS
+    ]
+
+    def _payloads(self) -> Iterator[LazyPayload]:
+        for picture in self.pictures:
+            if isinstance(picture.data, LazyPayload):
+                yield picture.data
 
 
 class FLACMetadata(Metadata):
@@ -26,16 +63,30 @@ class FLACMetadata(Metadata):
         (RCOOK_ALBUM_ID_ATTR, "rcook_album_id"),
         (RCOOK_TRACK_ID_ATTR, "rcook_track_id")
     ]
+    POS_MAPPINGS: Sequence[Tuple[str, str, Sequence[str], str, Sequence[str]]] = [
+        (TRACK_DISC_ATTR, "discnumber", [], "totaldiscs", ["disctotal"]),
+        (TRACK_NUMBER_ATTR, "tracknumber", [], "totaltracks", ["tracktotal"])
+    ]
     KEYS: dict[str, str] = {tag: key for tag, key in MAPPINGS}
-    TAGS: dict[str, str] = {key: tag for tag, key in MAPPINGS}
+    TAGS: dict[str, str] = {key: tag for tag, key in MAPPINGS} | {
+        key: tag
+        for tag, index_key, other_index_keys, total_key, other_total_keys in POS_MAPPINGS
+        for key in [index_key, *other_index_keys, total_key, *other_total_keys]
+    }
+    FILE_TYPES: dict[Tuple[bool, bool], type] = {
+        (False, False): FLAC,
+        (True, False): FLAC,
+        (False, True): LazyFLAC,
+        (True, True): LazyFLAC,
+    }
 
     @dataclass(frozen=True)
     class PosTag:
         obj: "FLACMetadata"
         index_key: str
-        other_index_keys: list[str]
+        other_index_keys: Sequence[str]
         total_key: str
-        other_total_keys: list[str]
+        other_total_keys: Sequence[str]
 
         def get(self, default: Any) -> Any:
             index_str = self.obj._get_raw(
@@ -43,7 +94,8 @@ class FLACMetadata(Metadata):
                 default=default if default is MISSING else None)
             for k in self.other_index_keys:
                 s = self.obj._get_raw(key=k, default=None)
-                assert s is None or s == index_str
+                if s is not None and s != index_str:
+                    raise ValueError(f"Value {s} of {k} does not match value {index_str} of {self.index_key}")
 
             if index_str is None:
                 return default
@@ -51,7 +103,8 @@ class FLACMetadata(Metadata):
             total_str = self.obj._get_raw(key=self.total_key, default=None)
             for k in self.other_total_keys:
                 s = self.obj._get_raw(key=k, default=None)
-                assert s is None or s == total_str
+                if s is not None and s != total_str:
+                    raise ValueError(f"Value {s} of {k} does not match value {total_str} of {self.total_key}")
 
             index = int(index_str)
             total = None if total_str is None else int(total_str)
@@ -59,34 +112,31 @@ class FLACMetadata(Metadata):
 
         def set(self, value: Pos) -> None:
             s = str(value.index)
-            for k in [self.index_key] + self.other_index_keys:
+            for k in [self.index_key, *self.other_index_keys]:
                 self.obj._set_raw(key=k, value=s)
 
             s = str(value.total)
-            for k in [self.total_key] + self.other_total_keys:
+            for k in [self.total_key, *self.other_total_keys]:
                 if value.total is None:
                     self.obj._del_raw(key=k)
                 else:
                     self.obj._set_raw(key=k, value=s)
 
         def delete(self) -> None:
-            for k in [self.index_key, self.total_key] + self.other_index_keys + self.other_total_keys:
+            for k in [self.index_key, self.total_key, *self.other_index_keys, *self.other_total_keys]:
                 self.obj._del_raw(key=k)
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self._track_disc = self.__class__.PosTag(
-            obj=self,
-            index_key="discnumber",
-            other_index_keys=[],
-            total_key="totaldiscs",
-            other_total_keys=["disctotal"])
-        self._track_number = self.__class__.PosTag(
-            obj=self,
-            index_key="tracknumber",
-            other_index_keys=[],
-            total_key="totaltracks",
-            other_total_keys=["tracktotal"])
+        self._pos_tags = {
+            tag: self.__class__.PosTag(
+                obj=self,
+                index_key=index_key,
+                other_index_keys=other_index_keys,
+                total_key=total_key,
+                other_total_keys=other_total_keys)
+            for tag, index_key, other_index_keys, total_key, other_total_keys in self.__class__.POS_MAPPINGS
+        }
 
     def _get_tag(self, tag: str, default: Any = MISSING) -> Any:
         return self._get_raw(key=self.__class__.KEYS[tag], default=default)
@@ -98,43 +148,63 @@ class FLACMetadata(Metadata):
         self._del_raw(key=self.__class__.KEYS[tag])
 
     def _get_track_disc(self, default: Any = MISSING) -> Any:
-        return self._track_disc.get(default=default)
+        return self._pos_tags[TRACK_DISC_ATTR].get(default=default)
 
     def _set_track_disc(self, value: Pos) -> None:
-        self._track_disc.set(value=value)
+        self._pos_tags[TRACK_DISC_ATTR].set(value=value)
 
     def _del_track_disc(self) -> None:
-        self._track_disc.delete()
+        self._pos_tags[TRACK_DISC_ATTR].delete()
 
     def _get_track_number(self, default: Any = MISSING) -> Any:
-        return self._track_number.get(default=default)
+        return self._pos_tags[TRACK_NUMBER_ATTR].get(default=default)
 
     def _set_track_number(self, value: Pos) -> None:
-        self._track_number.set(value=value)
+        self._pos_tags[TRACK_NUMBER_ATTR].set(value=value)
 
     def _del_track_number(self) -> None:
-        self._track_number.delete()
+        self._pos_tags[TRACK_NUMBER_ATTR].delete()
+
+    def _index_raw_tags(self) -> Mapping[str, Any]:
+        index: dict[str, list[str]] = {}
+        if self._m.tags is not None:
+            for key, value in self._m.tags:
+                index.setdefault(key.lower(), []).append(value)
+        return index
 
     def _get_raw(self, key: str, default: Any = MISSING) -> Any:
-        if default is MISSING:
-            return self._m.tags[key]
-        else:
+        if self._raw_index is not None:
+            values = self._raw_index.get(key.lower())
+        elif self._m.tags is not None:
             values = self._m.tags.get(key)
-            if values is None:
-                return default
+        else:
+            values = None
+
+        if values is None:
+            if default is MISSING:
+                raise KeyError(key)
+            return default
 
-        assert isinstance(values, list) and len(values) == 1
+        if not isinstance(values, list) or len(values) != 1:
+            raise ValueError(f"Expected a single value for {key}")
 
         value = values[0]
-        assert isinstance(value, str)
+        if not isinstance(value, str):
+            raise ValueError(f"Expected a string value for {key}")
 
         return value
 
     def _set_raw(self, key: str, value: Any) -> None:
+        self._invalidate_raw(key.lower())
+        if self._m.tags is None:
+            self._m.add_tags()
+            assert self._m.tags is not None
         self._m.tags[key] = value
 
     def _del_raw(self, key: str) -> None:
-        try:
-            del self._m.tags[key]
-        except KeyError:
-            pass
+        self._invalidate_raw(key.lower())
+        if self._m.tags is not None:
+            try:
+                del self._m.tags[key]
+            except KeyError:
+                pass
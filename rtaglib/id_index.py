@@ -0,0 +1,74 @@
+from pathlib import Path
+from rtaglib.metadata import \
+    MUSICBRAINZ_ALBUM_ID_ATTR, \
+    RCOOK_TRACK_ID_ATTR, \
+    Metadata, \
+    MetadataMeta, \
+    Snapshot
+from typing import Iterable, Sequence, Tuple
+from uuid import UUID
+
+
+UUID_TAGS: Sequence[str] = [tag for tag, tag_type, _ in MetadataMeta._TAGS if tag_type is UUID]
+
+
+class IdIndex:
+    def __init__(self) -> None:
+        self._paths: dict[str, dict[UUID, set[Path]]] = {tag: {} for tag in UUID_TAGS}
+        self._ids: dict[Path, Tuple[UUID | None, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, path: Path) -> bool:
+        return path in self._ids
+
+    def consume(self, results: Iterable[Tuple[Path, Metadata | Exception]]) -> None:
+        for path, metadata in results:
+            self.update(path, metadata)
+
+    def update(self, path: Path, metadata: Metadata | Snapshot | Exception) -> None:
+        self.remove(path)
+        if isinstance(metadata, Exception):
+            return
+
+        snapshot = metadata.snapshot() if isinstance(metadata, Metadata) else metadata
+        ids = tuple(getattr(snapshot, tag) for tag in UUID_TAGS)
+        self._ids[path] = ids
+        for tag, value in zip(UUID_TAGS, ids):
+            if value is not None:
+                self._paths[tag].setdefault(value, set()).add(path)
+
+    def remove(self, path: Path) -> None:
+        ids = self._ids.pop(path, None)
+        if ids is None:
+            return
+
+        for tag, value in zip(UUID_TAGS, ids):
+            if value is not None:
+                paths = self._paths[tag][value]
+                paths.discard(path)
+                if not paths:
+                    del self._paths[tag][value]
+
+    def lookup(self, tag: str, value: UUID) -> set[Path]:
+        return set(self._paths[tag].get(value, ()))
+
+    def duplicates(self, tag: str = RCOOK_TRACK_ID_ATTR) -> dict[UUID, list[Path]]:
+        return {
+            value: sorted(paths)
+            for value, paths in self._paths[tag].items()
+            if len(paths) > 1
+        }
+
+    def split_albums(self, tag: str = MUSICBRAINZ_ALBUM_ID_ATTR) -> dict[UUID, list[Path]]:
+        result = {}
+        for value, paths in self._paths[tag].items():
+            dirs = {path.parent for path in paths}
+            if len(dirs) > 1:
+                result[value] = sorted(dirs)
+        return result
+
+    def missing(self, tag: str) -> list[Path]:
+        i = UUID_TAGS.index(tag)
+        return sorted(path for path, ids in self._ids.items() if ids[i] is None)
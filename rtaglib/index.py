@@ -0,0 +1,207 @@
+from dataclasses import dataclass
+from os import stat_result
+from pathlib import Path
+from rtaglib.metadata import Metadata, MetadataMeta
+from rtaglib.pos import Pos
+from rtaglib.scan import Shard, check_shard, scan_paths, shard_of, walk
+from typing import Any, Callable, Iterator, Sequence
+from uuid import UUID
+import sqlite3
+
+
+TAGS: Sequence[str] = [tag for tag, _, _ in MetadataMeta._TAGS]
+COLUMNS: Sequence[str] = ["path", "size", "mtime_ns", "inode", "format", "error", *TAGS]
+
+DECODERS: dict[type, Callable[[str], Any]] = {
+    str: str,
+    Pos: Pos.parse,
+    UUID: UUID,
+}
+
+
+@dataclass(frozen=True)
+class RefreshResult:
+    unchanged: int
+    updated: int
+    removed: int
+
+
+@dataclass(frozen=True)
+class MergeResult:
+    merged: int
+    skipped: int
+
+
+class TagIndex:
+    def __init__(self, path: Path) -> None:
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        tag_columns = "".join(f", {tag} TEXT" for tag in TAGS)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT PRIMARY KEY, "
+            "size INTEGER NOT NULL, "
+            "mtime_ns INTEGER NOT NULL, "
+            "inode INTEGER NOT NULL, "
+            "format TEXT, "
+            f"error TEXT{tag_columns})")
+        self._db.commit()
+
+    def __enter__(self) -> "TagIndex":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def get(self, path: Path, fresh: bool = False) -> dict[str, Any] | None:
+        path = path.absolute()
+        row = self._db.execute(
+            f"SELECT size, mtime_ns, inode, {', '.join(TAGS)} FROM files WHERE path = ? AND format IS NOT NULL",
+            (str(path),)).fetchone()
+        if row is None:
+            return None
+        if fresh:
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                return None
+            if tuple(row[:3]) != (st.st_size, st.st_mtime_ns, st.st_ino):
+                return None
+        return self.__class__._decode(row[3:])
+
+    def find(self, tag: str, value: Any) -> list[Path]:
+        self.__class__._check_tag(tag)
+        return [
+            Path(path)
+            for path, in self._db.execute(
+                f"SELECT path FROM files WHERE {tag} = ? ORDER BY path",
+                (str(value),))
+        ]
+
+    def missing(self, tag: str) -> list[Path]:
+        self.__class__._check_tag(tag)
+        return [
+            Path(path)
+            for path, in self._db.execute(
+                f"SELECT path FROM files WHERE {tag} IS NULL AND format IS NOT NULL ORDER BY path")
+        ]
+
+    def errors(self) -> list[tuple[Path, str]]:
+        return [
+            (Path(path), error)
+            for path, error in self._db.execute(
+                "SELECT path, error FROM files WHERE error IS NOT NULL ORDER BY path")
+        ]
+
+    def update(self, path: Path, metadata: Metadata | Exception) -> None:
+        path = path.absolute()
+        self._put(path=path, st=path.stat(), metadata=metadata)
+        self._db.commit()
+
+    def remove(self, path: Path) -> None:
+        self._db.execute("DELETE FROM files WHERE path = ?", (str(path.absolute()),))
+        self._db.commit()
+
+    def refresh(self, root: Path, workers: int | None = None, processes: bool = False, tags_only: bool = True, shard: Shard | None = None) -> RefreshResult:
+        root = root.absolute()
+        prefix = str(root).rstrip("/") + "/"
+        if shard is not None:
+            index, count = check_shard(shard)
+        known = {
+            path: (size, mtime_ns, inode)
+            for path, size, mtime_ns, inode in self._db.execute(
+                "SELECT path, size, mtime_ns, inode FROM files WHERE substr(path, 1, ?) = ?",
+                (len(prefix), prefix))
+            if shard is None or shard_of(Path(path), root, count) == index
+        }
+
+        stats: dict[Path, stat_result] = {}
+        unchanged = 0
+        for path in walk(root, shard=shard):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            if known.pop(str(path), None) == (st.st_size, st.st_mtime_ns, st.st_ino):
+                unchanged += 1
+            else:
+                stats[path] = st
+
+        updated = 0
+        for path, metadata in scan_paths(stats, workers=workers, processes=processes, tags_only=tags_only):
+            self._put(path=path, st=stats[path], metadata=metadata)
+            updated += 1
+            if updated % 1000 == 0:
+                self._db.commit()
+
+        self._db.executemany(
+            "DELETE FROM files WHERE path = ?",
+            ((path,) for path in known))
+        self._db.commit()
+
+        return RefreshResult(unchanged=unchanged, updated=updated, removed=len(known))
+
+    def merge(self, path: Path) -> MergeResult:
+        if not path.is_file():
+            raise FileNotFoundError(f"No index at {path}")
+
+        columns = ", ".join(COLUMNS)
+        self._db.commit()
+        self._db.execute("ATTACH DATABASE ? AS part", (str(path),))
+        try:
+            total, = self._db.execute("SELECT COUNT(*) FROM part.files").fetchone()
+            before = self._db.total_changes
+            self._db.execute(
+                f"INSERT OR REPLACE INTO main.files ({columns}) "
+                f"SELECT {columns} FROM part.files AS p "
+                "WHERE NOT EXISTS ("
+                "SELECT 1 FROM main.files AS f WHERE f.path = p.path AND f.mtime_ns >= p.mtime_ns)")
+            merged = self._db.total_changes - before
+            self._db.commit()
+        finally:
+            self._db.execute("DETACH DATABASE part")
+
+        return MergeResult(merged=merged, skipped=total - merged)
+
+    def entries(self) -> Iterator[tuple[Path, dict[str, Any]]]:
+        for path, *row in self._db.execute(
+                f"SELECT path, {', '.join(TAGS)} FROM files WHERE format IS NOT NULL ORDER BY path"):
+            yield Path(path), self.__class__._decode(row)
+
+    def _put(self, path: Path, st: stat_result, metadata: Metadata | Exception) -> None:
+        format = None
+        error = None
+        values: list[str | None] = [None] * len(TAGS)
+        if isinstance(metadata, Exception):
+            error = str(metadata)
+        else:
+            format = metadata.__class__.__name__
+            try:
+                values = [
+                    None if value is None else str(value)
+                    for value in (metadata.get_tag(tag, default=None) for tag in TAGS)
+                ]
+            except Exception as e:
+                error = str(e)
+
+        self._db.execute(
+            f"INSERT OR REPLACE INTO files ({', '.join(COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(COLUMNS))})",
+            (str(path), st.st_size, st.st_mtime_ns, st.st_ino, format, error, *values))
+
+    @staticmethod
+    def _check_tag(tag: str) -> None:
+        if tag not in MetadataMeta._TO_TAG_INFOS:
+            raise ValueError(f"Unknown tag {tag}")
+
+    @staticmethod
+    def _decode(row: Sequence[str | None]) -> dict[str, Any]:
+        return {
+            tag: DECODERS[MetadataMeta._TO_TAG_INFOS[tag][0]](value)
+            for tag, value in zip(TAGS, row)
+            if value is not None
+        }
@@ -0,0 +1,142 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from rtaglib.metadata import Metadata
+from rtaglib.padding import SaveResult
+from shutil import copy2
+from typing import Any, Sequence
+import json
+import os
+
+
+PREPARING = "preparing"
+PREPARED = "prepared"
+COMMITTED = "committed"
+
+
+def _fsync_dir(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_file(path: Path) -> None:
+    with open(path, "rb+") as f:
+        os.fsync(f.fileno())
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    try:
+        os.link(src, dst)
+    except OSError:
+        copy2(src, dst)
+
+
+def _remove(path: Path) -> None:
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class JournalError(Exception):
+    pass
+
+
+class WriteBatch:
+    def __init__(self, journal_path: Path) -> None:
+        self._journal_path = journal_path
+        self._staged: list[Metadata] = []
+
+    def __len__(self) -> int:
+        return len(self._staged)
+
+    def stage(self, metadata: Metadata) -> None:
+        self._staged.append(metadata)
+
+    def commit(self, workers: int | None = None) -> Sequence[SaveResult]:
+        if self._journal_path.exists():
+            raise JournalError(f"Journal {self._journal_path} exists: recover it before committing")
+
+        items = [m for m in self._staged if m.dirty]
+        entries = [
+            {
+                "path": str(m.path),
+                "tmp": str(m.path.with_name(f".{m.path.name}.rtaglib-tmp")),
+                "backup": str(m.path.with_name(f".{m.path.name}.rtaglib-orig")),
+            }
+            for m in items
+        ]
+
+        self._write_journal(PREPARING, entries)
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(self.__class__._prepare, items, entries))
+        except BaseException:
+            self.__class__.recover(self._journal_path, roll_forward=False)
+            raise
+        self._write_journal(PREPARED, entries)
+
+        for entry in entries:
+            _link_or_copy(Path(entry["path"]), Path(entry["backup"]))
+            os.replace(entry["tmp"], entry["path"])
+        for parent in {Path(entry["path"]).parent for entry in entries}:
+            _fsync_dir(parent)
+        self._write_journal(COMMITTED, entries)
+
+        for entry in entries:
+            _remove(Path(entry["backup"]))
+        _remove(self._journal_path)
+
+        for m in items:
+            m._changes.clear()
+            m._reload_payloads()
+        self._staged.clear()
+        return results
+
+    @staticmethod
+    def recover(journal_path: Path, roll_forward: bool = True) -> None:
+        try:
+            journal = json.loads(journal_path.read_text())
+        except FileNotFoundError:
+            return
+
+        state = journal["state"]
+        entries = journal["files"]
+        if state == PREPARED and roll_forward:
+            for entry in entries:
+                path, tmp, backup = Path(entry["path"]), Path(entry["tmp"]), Path(entry["backup"])
+                if tmp.exists():
+                    if not backup.exists():
+                        _link_or_copy(path, backup)
+                    os.replace(tmp, path)
+        elif state in (PREPARING, PREPARED):
+            for entry in entries:
+                path, tmp, backup = Path(entry["path"]), Path(entry["tmp"]), Path(entry["backup"])
+                if backup.exists():
+                    os.replace(backup, path)
+                _remove(tmp)
+
+        for parent in {Path(entry["path"]).parent for entry in entries}:
+            _fsync_dir(parent)
+        for entry in entries:
+            _remove(Path(entry["backup"]))
+        _remove(journal_path)
+
+    @staticmethod
+    def _prepare(metadata: Metadata, entry: dict[str, str]) -> SaveResult:
+        tmp = Path(entry["tmp"])
+        copy2(entry["path"], tmp)
+        result = metadata._write(path=tmp)
+        _fsync_file(tmp)
+        return result
+
+    def _write_journal(self, state: str, entries: list[dict[str, Any]]) -> None:
+        tmp = self._journal_path.with_name(self._journal_path.name + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump({"state": state, "files": entries}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._journal_path)
+        _fsync_dir(self._journal_path.parent)
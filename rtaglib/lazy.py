@@ -0,0 +1,67 @@
+from mmap import ACCESS_READ, mmap
+from mutagen._util import loadfile
+from os import fstat, stat, stat_result
+from typing import Any, BinaryIO, Iterator, Tuple
+
+
+def _signature(st: stat_result) -> Tuple[int, int, int]:
+    return st.st_size, st.st_mtime_ns, st.st_ino
+
+
+class LazyPayload:
+    def __init__(self, offset: int, length: int) -> None:
+        self.offset = offset
+        self.length = length
+        self._path: str | None = None
+        self._fileobj: BinaryIO | None = None
+        self._signature: Tuple[int, int, int] | None = None
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(offset={self.offset}, length={self.length})"
+
+    def bind(self, source: str | BinaryIO) -> None:
+        if isinstance(source, str):
+            self._path = source
+            self._signature = _signature(stat(source))
+        else:
+            self._fileobj = source
+
+    def read(self) -> bytes:
+        if self._fileobj is not None:
+            return self._read_fileobj(self._fileobj)
+        if self._path is None:
+            raise ValueError(f"{self!r} is not bound to a file")
+
+        with open(self._path, "rb") as f:
+            if _signature(fstat(f.fileno())) != self._signature:
+                raise ValueError(f"File {self._path} changed since {self!r} was loaded")
+            if self.length == 0:
+                return b""
+            with mmap(f.fileno(), 0, access=ACCESS_READ) as m:
+                return m[self.offset:self.offset + self.length]
+
+    def _read_fileobj(self, f: BinaryIO) -> bytes:
+        position = f.tell()
+        try:
+            f.seek(self.offset)
+            data = f.read(self.length)
+        finally:
+            f.seek(position)
+        if len(data) != self.length:
+            raise ValueError(f"Unexpected end of file reading {self!r}")
+        return data
+
+
+class LazyFileType:
+    @loadfile()
+    def load(self, filething: Any, *args: Any, **kwargs: Any) -> None:
+        super().load(filething, *args, **kwargs)  # type: ignore
+        source = filething.fileobj if filething.filename is None else filething.filename
+        for payload in self._payloads():
+            payload.bind(source)
+
+    def _payloads(self) -> Iterator[LazyPayload]:
+        raise NotImplementedError()
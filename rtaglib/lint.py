@@ -0,0 +1,203 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from rtaglib.metadata import \
+    MUSICBRAINZ_ALBUM_ID_ATTR, \
+    TRACK_DISC_ATTR, \
+    TRACK_NUMBER_ATTR, \
+    Metadata, \
+    MetadataMeta
+from rtaglib.pos import Pos
+from rtaglib.scan import map_paths, walk
+from typing import Any, Iterator, Sequence
+from uuid import UUID
+
+
+UNREADABLE_FILE = "unreadable-file"
+INVALID_TAG = "invalid-tag"
+DUPLICATE_TRACK = "duplicate-track"
+MISSING_TRACK = "missing-track"
+INCONSISTENT_TOTAL = "inconsistent-total"
+INCONSISTENT_ALBUM_ID = "inconsistent-album-id"
+MISSING_ALBUM_ID = "missing-album-id"
+
+TAGS: Sequence[str] = [tag for tag, _, _ in MetadataMeta._TAGS]
+
+
+@dataclass(frozen=True)
+class Issue:
+    rule: str
+    path: Path
+    message: str
+    tag: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "rule": self.rule,
+            "path": str(self.path),
+            "tag": self.tag,
+            "message": self.message,
+        }
+
+
+@dataclass(frozen=True)
+class FileCheck:
+    path: Path
+    issues: Sequence[Issue] = ()
+    track_disc: Pos | None = None
+    track_number: Pos | None = None
+    musicbrainz_album_id: UUID | None = None
+    supported: bool = True
+
+
+@dataclass(frozen=True)
+class LintReport:
+    files: int
+    albums: int
+    issues: Sequence[Issue] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return len(self.issues) == 0
+
+    def by_rule(self) -> dict[str, list[Issue]]:
+        result: dict[str, list[Issue]] = {}
+        for issue in self.issues:
+            result.setdefault(issue.rule, []).append(issue)
+        return result
+
+
+def lint(root: Path, workers: int | None = None, processes: bool = False) -> LintReport:
+    counts: Counter[str] = Counter()
+    issues = list(_lint(root, workers=workers, processes=processes, counts=counts))
+    return LintReport(files=counts["files"], albums=counts["albums"], issues=issues)
+
+
+def iter_issues(root: Path, workers: int | None = None, processes: bool = False) -> Iterator[Issue]:
+    return _lint(root, workers=workers, processes=processes, counts=Counter())
+
+
+def check_file(path: Path) -> FileCheck:
+    try:
+        m = Metadata.load(path, tags_only=True, lazy=True)
+    except NotImplementedError:
+        return FileCheck(path=path, supported=False)
+    except Exception as e:
+        return FileCheck(path=path, issues=[Issue(rule=UNREADABLE_FILE, path=path, message=str(e))], supported=False)
+
+    issues = []
+    values = {}
+    for tag in TAGS:
+        try:
+            values[tag] = m.get_tag(tag, default=None)
+        except (ValueError, NotImplementedError) as e:
+            issues.append(Issue(rule=INVALID_TAG, path=path, message=str(e) or e.__class__.__name__, tag=tag))
+
+    return FileCheck(
+        path=path,
+        issues=issues,
+        track_disc=values.get(TRACK_DISC_ATTR),
+        track_number=values.get(TRACK_NUMBER_ATTR),
+        musicbrainz_album_id=values.get(MUSICBRAINZ_ALBUM_ID_ATTR))
+
+
+def check_album(directory: Path, files: Sequence[FileCheck]) -> Iterator[Issue]:
+    discs: dict[int, dict[int, list[Path]]] = {}
+    track_totals: dict[int, set[int]] = {}
+    for f in files:
+        disc = 1 if f.track_disc is None or f.track_disc.index is None else f.track_disc.index
+        if f.track_number is not None and f.track_number.index is not None:
+            discs.setdefault(disc, {}).setdefault(f.track_number.index, []).append(f.path)
+        if f.track_number is not None and f.track_number.total is not None:
+            track_totals.setdefault(disc, set()).add(f.track_number.total)
+
+    for disc, tracks in sorted(discs.items()):
+        for index, paths in sorted(tracks.items()):
+            if len(paths) > 1:
+                yield Issue(
+                    rule=DUPLICATE_TRACK,
+                    path=directory,
+                    message=f"Disc {disc} track {index} is used by {', '.join(sorted(p.name for p in paths))}",
+                    tag=TRACK_NUMBER_ATTR)
+
+        totals = track_totals.get(disc, set())
+        if len(totals) > 1:
+            yield Issue(
+                rule=INCONSISTENT_TOTAL,
+                path=directory,
+                message=f"Disc {disc} has track totals {', '.join(map(str, sorted(totals)))}",
+                tag=TRACK_NUMBER_ATTR)
+
+        expected = max(totals) if totals else max(tracks)
+        missing = [i for i in range(1, expected + 1) if i not in tracks]
+        if missing:
+            yield Issue(
+                rule=MISSING_TRACK,
+                path=directory,
+                message=f"Disc {disc} is missing tracks {', '.join(map(str, missing))}",
+                tag=TRACK_NUMBER_ATTR)
+
+    disc_totals = {f.track_disc.total for f in files if f.track_disc is not None and f.track_disc.total is not None}
+    if len(disc_totals) > 1:
+        yield Issue(
+            rule=INCONSISTENT_TOTAL,
+            path=directory,
+            message=f"Album has disc totals {', '.join(map(str, sorted(disc_totals)))}",
+            tag=TRACK_DISC_ATTR)
+
+    album_ids = {f.musicbrainz_album_id for f in files if f.musicbrainz_album_id is not None}
+    if len(album_ids) > 1:
+        yield Issue(
+            rule=INCONSISTENT_ALBUM_ID,
+            path=directory,
+            message=f"Album has {len(album_ids)} distinct values: {', '.join(sorted(str(i) for i in album_ids))}",
+            tag=MUSICBRAINZ_ALBUM_ID_ATTR)
+    if album_ids:
+        for f in files:
+            if f.musicbrainz_album_id is None and not any(i.tag == MUSICBRAINZ_ALBUM_ID_ATTR for i in f.issues):
+                yield Issue(
+                    rule=MISSING_ALBUM_ID,
+                    path=f.path,
+                    message="File has no album ID but other files in its album do",
+                    tag=MUSICBRAINZ_ALBUM_ID_ATTR)
+
+
+def _lint(root: Path, workers: int | None, processes: bool, counts: Counter[str]) -> Iterator[Issue]:
+    expected: dict[Path, int] = {}
+    received: Counter[Path] = Counter()
+    albums: dict[Path, list[FileCheck]] = {}
+
+    def paths() -> Iterator[Path]:
+        directory = None
+        n = 0
+        for path in walk(root):
+            if path.parent != directory:
+                if directory is not None:
+                    expected[directory] = n
+                directory = path.parent
+                n = 0
+            n += 1
+            yield path
+        if directory is not None:
+            expected[directory] = n
+
+    for path, result in map_paths(paths(), check_file, workers=workers, processes=processes):
+        yield from result.issues
+        directory = path.parent
+        if result.supported:
+            counts["files"] += 1
+            albums.setdefault(directory, []).append(result)
+        received[directory] += 1
+        for directory in [d for d, n in expected.items() if received[d] == n]:
+            yield from _finish_album(directory, albums, counts)
+            del expected[directory], received[directory]
+
+    for directory in list(albums):
+        yield from _finish_album(directory, albums, counts)
+
+
+def _finish_album(directory: Path, albums: dict[Path, list[FileCheck]], counts: Counter[str]) -> Iterator[Issue]:
+    files = albums.pop(directory, None)
+    if files:
+        counts["albums"] += 1
+        yield from check_album(directory, files)
@@ -1,11 +1,21 @@
 from abc import ABCMeta, abstractmethod
+from contextlib import nullcontext
 from dataclasses import MISSING
-from functools import cached_property, partial
+from functools import cached_property
+from io import BytesIO
+from os import PathLike, fspath
 from pathlib import Path
+from rtaglib.padding import PaddingFunction, PaddingRecorder, SaveResult
 from rtaglib.pos import Pos
-from typing import Any, Callable, Sequence, Tuple
+from rtaglib.registry import detect
+from rtaglib.stats import CountingFile, current_collector
+from time import perf_counter
+from typing import Any, BinaryIO, Callable, Iterator, Mapping, NamedTuple, Sequence, Tuple, TYPE_CHECKING
 from uuid import UUID
 
+if TYPE_CHECKING:
+    from rtaglib.index import TagIndex
+
 
 ARTIST_TITLE_ATTR = "artist_title"
 ALBUM_TITLE_ATTR = "album_title"
@@ -19,6 +29,13 @@ RCOOK_ARTIST_ID_ATTR = "rcook_artist_id"
 RCOOK_ALBUM_ID_ATTR = "rcook_album_id"
 RCOOK_TRACK_ID_ATTR = "rcook_track_id"
 
+class TagAccessor(NamedTuple):
+    getter: Callable[[Any, Any], Any]
+    setter: Callable[[Any, Any], None]
+    deleter: Callable[[Any], None]
+    tag_type: type
+    tag_ctor: Callable
+
 
 class MetadataMeta(ABCMeta):
     _TAGS: Sequence[Tuple[str, type, Callable]] = [
@@ -40,47 +57,142 @@ class MetadataMeta(ABCMeta):
     }
 
     def __new__(cls, name, bases, dct):
-        def fget(tag, self):
+        t = super().__new__(cls, name, bases, dct)
+
+        accessors = {
+            tag: cls._make_accessor(t, tag, tag_type, tag_ctor)
+            for tag, tag_type, tag_ctor in cls._TAGS
+        }
+        for tag, accessor in accessors.items():
+            setattr(t, tag, cls._make_property(tag, accessor))
+        t._ACCESSORS = accessors
+
+        return t
+
+    @staticmethod
+    def _make_accessor(t: type, tag: str, tag_type: type, tag_ctor: Callable) -> "TagAccessor":
+        get_tag, set_tag, del_tag = t._get_tag, t._set_tag, t._del_tag  # type: ignore
+
+        def get_generic(self: Any, default: Any) -> Any:
+            return get_tag(self, tag, default)
+
+        def set_generic(self: Any, value: Any) -> None:
+            set_tag(self, tag, value)
+
+        def del_generic(self: Any) -> None:
+            del_tag(self, tag)
+
+        return TagAccessor(
+            getter=getattr(t, f"_get_{tag}", get_generic),
+            setter=getattr(t, f"_set_{tag}", set_generic),
+            deleter=getattr(t, f"_del_{tag}", del_generic),
+            tag_type=tag_type,
+            tag_ctor=tag_ctor)
+
+    @staticmethod
+    def _make_property(tag: str, accessor: "TagAccessor") -> property:
+        def fget(self: Any) -> Any:
+            value = self._values.get(tag, MISSING)
+            if value is not MISSING:
+                return value
             return self.get_tag(tag, default=None)
 
-        def fset(tag, self, value):
-            return self.set_tag(tag, value)
+        def fset(self: Any, value: Any) -> None:
+            self.set_tag(tag, value)
 
-        def fdel(tag, self):
-            return self.del_tag(tag)
+        def fdel(self: Any) -> None:
+            self.del_tag(tag)
+
+        return property(fget, fset, fdel)
+
+
+class Change(NamedTuple):
+    old: Any
+    new: Any
 
-        t = super().__new__(cls, name, bases, dct)
-        for tag, _, _ in cls._TAGS:
-            setattr(
-                t,
-                tag,
-                property(partial(fget, tag), partial(fset, tag), partial(fdel, tag)))
-        return t
+
+class Snapshot(NamedTuple):
+    artist_title: str | None
+    album_title: str | None
+    track_title: str | None
+    track_disc: Pos | None
+    track_number: Pos | None
+    musicbrainz_artist_id: UUID | None
+    musicbrainz_album_id: UUID | None
+    musicbrainz_track_id: UUID | None
+    rcook_artist_id: UUID | None
+    rcook_album_id: UUID | None
+    rcook_track_id: UUID | None
 
 
 class Metadata(metaclass=MetadataMeta):
+    _ACCESSORS: dict[str, TagAccessor]
+
+    TAGS: Mapping[str, str] = {}
+    FILE_TYPES: Mapping[Tuple[bool, bool], type] = {}
+
+    padding: PaddingFunction | None = None
+    _raw_index: Mapping[str, Any] | None = None
+
+    @staticmethod
+    def load(path: "Path | BinaryIO | bytes", tags_only: bool = False, lazy: bool = False, name: str | None = None) -> "Metadata":
+        if isinstance(path, (bytes, bytearray, memoryview)):
+            path = BytesIO(path)
+
+        fileobj: BinaryIO | None = None
+        if isinstance(path, (str, PathLike)):
+            path = Path(path)
+            filename: str | None = fspath(path)
+        else:
+            fileobj = path
+            if name is None:
+                name = getattr(fileobj, "name", None)
+            path = Path(name if isinstance(name, str) else "")
+            filename = None
+
+        collector = current_collector()
+        start = perf_counter()
+        with open(path, "rb") if fileobj is None else nullcontext(fileobj) as raw:
+            opened = perf_counter()
+            f: Any = raw if collector is None else CountingFile(raw)
+            metadata_type = detect(f, path)
+            if metadata_type is not None:
+                m = metadata_type._open(f, filename, tags_only=tags_only, lazy=lazy)
+            parsed = perf_counter()
+
+        if collector is not None:
+            format = "unsupported" if metadata_type is None else metadata_type.__name__
+            collector.timing("open", format, opened - start)
+            collector.timing("parse", format, parsed - opened)
+            collector.count("bytes_read", format, f.bytes_read)
+            if metadata_type is None:
+                collector.count("unsupported", format)
+
+        if metadata_type is None:
+            raise NotImplementedError(f"Unsupported file format in file {path}")
+        return metadata_type(m=m, fileobj=fileobj)
+
+    @staticmethod
+    async def aload(path: "Path | BinaryIO | bytes", tags_only: bool = False, lazy: bool = False, name: str | None = None) -> "Metadata":
+        import asyncio
+        return await asyncio.to_thread(Metadata.load, path, tags_only=tags_only, lazy=lazy, name=name)
+
     @staticmethod
-    def load(path: Path) -> "Metadata":
-        from rtaglib.flac_metadata import FLACMetadata
-        from rtaglib.mp3_metadata import MP3Metadata
-        from rtaglib.mp4_metadata import MP4Metadata
-        from rtaglib.wma_metadata import WMAMetadata
-        import mutagen
-        import mutagen.asf
-        import mutagen.flac
-        import mutagen.mp3
-        import mutagen.mp4
-
-        m = mutagen.File(path)
-        match m:
-            case mutagen.flac.FLAC(): return FLACMetadata(m=m)
-            case mutagen.mp3.MP3(): return MP3Metadata(m=m)
-            case mutagen.mp4.MP4(): return MP4Metadata(m=m)
-            case mutagen.asf.ASF(): return WMAMetadata(m=m)
-            case _: raise NotImplementedError(f"Unsupported metadata type {type(m)} in file {path}")
-
-    def __init__(self, m: Any) -> None:
+    def scan(root: Path, workers: int | None = None, processes: bool = False, tags_only: bool = False, lazy: bool = False, shard: Tuple[int, int] | None = None) -> Iterator[Tuple[Path, "Metadata | Exception"]]:
+        from rtaglib.scan import scan
+        return scan(root=root, workers=workers, processes=processes, tags_only=tags_only, lazy=lazy, shard=shard)
+
+    @classmethod
+    def _open(cls, f: Any, filename: str | None, tags_only: bool = False, lazy: bool = False) -> Any:
+        file_type = cls.FILE_TYPES[(tags_only, lazy)]
+        f.seek(0)
+        return file_type(f, filename=filename)
+
+    def __init__(self, m: Any, fileobj: BinaryIO | None = None) -> None:
         self._m = m
+        self._fileobj = fileobj
+        self._changes: dict[str, Change] = {}
+        self._values: dict[str, Any] = {}
 
     def __str__(self) -> str:
         tags = "; ".join(
@@ -101,41 +213,176 @@ class Metadata(metaclass=MetadataMeta):
     def raw_tags(self) -> Sequence[str]:
         return self._m.tags.keys()
 
-    def save(self) -> None:
-        self._m.save()
+    @property
+    def path(self) -> Path:
+        if self._m.filename is None:
+            raise ValueError(f"{self.__class__.__name__} was loaded from a file object and has no path")
+        return Path(self._m.filename)
+
+    @property
+    def fileobj(self) -> BinaryIO | None:
+        return self._fileobj
+
+    @property
+    def dirty(self) -> bool:
+        return len(self._changes) > 0
+
+    def changes(self) -> Mapping[str, Change]:
+        return dict(self._changes)
+
+    def save(self, index: "TagIndex | None" = None, padding: PaddingFunction | None = None, force: bool = False) -> SaveResult:
+        if not self._changes and not force:
+            return SaveResult(written=False, in_place=True, bytes_moved=0)
+        self._check_indexable(index)
+
+        result = self._write(path=self.path if self._fileobj is None else self._fileobj, padding=padding)
+        self._changes.clear()
+        self._reload_payloads()
+        if index is not None:
+            index.update(path=self.path, metadata=self)
+        return result
+
+    def audio_digest(self, algorithm: str = "sha256") -> str:
+        from rtaglib.digest import audio_digest
+        return audio_digest(self.path, algorithm=algorithm)
+
+    def snapshot(self) -> Snapshot:
+        accessors = self.__class__._ACCESSORS
+        values = self._values
+        if len(values) < len(accessors):
+            self._raw_index = self._index_raw_tags()
+            try:
+                for tag, (getter, _, _, _, tag_ctor) in accessors.items():
+                    if tag not in values:
+                        value = getter(self, None)
+                        values[tag] = None if value is None else tag_ctor(value)
+            finally:
+                del self._raw_index
+        return Snapshot._make([values[tag] for tag in accessors])
+
+    async def asave(self, index: "TagIndex | None" = None, padding: PaddingFunction | None = None, force: bool = False) -> SaveResult:
+        import asyncio
+        self._check_indexable(index)
+        result = await asyncio.to_thread(self.save, padding=padding, force=force)
+        if index is not None and result.written:
+            index.update(path=self.path, metadata=self)
+        return result
 
     def pprint(self) -> str:
         return self._m.tags.pprint()
 
     def get_tag(self, tag: str, default: Any = MISSING) -> Any:
-        getter = getattr(self, f"_get_{tag}", None)
-        if getter is None:
-            value = self._get_tag(tag, default=default)
+        value = self._values.get(tag, MISSING)
+        if value is not MISSING and (value is not None or default is None):
+            return value
+
+        accessor = self.__class__._ACCESSORS[tag]
+        collector = current_collector()
+        if collector is None:
+            value = accessor.getter(self, default)
+            value = value if value is None else accessor.tag_ctor(value)
         else:
-            value = getter(default=default)
+            format = self.__class__.__name__
+            start = perf_counter()
+            value = accessor.getter(self, default)
+            decoded = perf_counter()
+            value = value if value is None else accessor.tag_ctor(value)
+            collector.timing("decode", format, decoded - start)
+            collector.timing("convert", format, perf_counter() - decoded)
 
-        tag_ctor = self.__class__._TO_TAG_INFOS[tag][1]
-        return value if value is None else tag_ctor(value)
+        if default is MISSING or default is None:
+            self._values[tag] = value
+        return value
 
     def set_tag(self, tag: str, value: Any) -> None:
-        tag_type = self.__class__._TO_TAG_INFOS[tag][0]
-        if not isinstance(value, tag_type):
+        accessor = self.__class__._ACCESSORS[tag]
+        if not isinstance(value, accessor.tag_type):
             raise ValueError(
                 f"Value {value} is not of required type "
-                f"{tag_type.__name__}")
+                f"{accessor.tag_type.__name__}")
 
-        setter = getattr(self, f"_set_{tag}", None)
-        if setter is None:
-            self._set_tag(tag, value)
-        else:
-            setter(value)
+        old = self._get_current(tag)
+        if old == value:
+            return
+
+        collector = current_collector()
+        start = perf_counter()
+        accessor.setter(self, value)
+        if collector is not None:
+            collector.timing("set", self.__class__.__name__, perf_counter() - start)
+        self._values.pop(tag, None)
+        self._record_change(tag, old, value)
 
     def del_tag(self, tag: str) -> None:
-        deleter = getattr(self, f"_del_{tag}", None)
-        if deleter is None:
-            self._del_tag(tag)
+        old = self._get_current(tag)
+        if old is None:
+            return
+
+        collector = current_collector()
+        start = perf_counter()
+        self.__class__._ACCESSORS[tag].deleter(self)
+        if collector is not None:
+            collector.timing("del", self.__class__.__name__, perf_counter() - start)
+        self._values.pop(tag, None)
+        self._record_change(tag, old, None)
+
+    def _write(self, path: "Path | BinaryIO", padding: PaddingFunction | None = None) -> SaveResult:
+        recorder = PaddingRecorder(padding=self.padding if padding is None else padding)
+        if not isinstance(path, PathLike):
+            path.seek(0)
+        collector = current_collector()
+        if collector is None:
+            self._m.save(fspath(path) if isinstance(path, PathLike) else path, padding=recorder)
+        else:
+            format = self.__class__.__name__
+            start = perf_counter()
+            with open(path, "rb+") if isinstance(path, PathLike) else nullcontext(path) as raw:
+                f = CountingFile(raw)
+                self._m.save(f, padding=recorder)
+            collector.timing("save", format, perf_counter() - start)
+            collector.count("bytes_read", format, f.bytes_read)
+            collector.count("bytes_written", format, f.bytes_written)
+            collector.count("bytes_moved", format, recorder.result.bytes_moved)
+            collector.count("files_in_place" if recorder.result.in_place else "files_rewritten", format)
+        return recorder.result
+
+    def _reload_payloads(self) -> None:
+        from mutagen import FileType
+        from rtaglib.lazy import LazyFileType
+        m: FileType = self._m
+        if isinstance(m, LazyFileType):
+            if self._fileobj is None:
+                self._m = m.__class__(m.filename)
+            else:
+                self._fileobj.seek(0)
+                self._m = m.__class__(self._fileobj)
+
+    def _check_indexable(self, index: "TagIndex | None") -> None:
+        if index is not None and self._fileobj is not None:
+            raise ValueError(f"{self.__class__.__name__} was loaded from a file object and cannot be indexed")
+
+    def _get_current(self, tag: str) -> Any:
+        try:
+            return self.get_tag(tag, default=None)
+        except ValueError:
+            return MISSING
+
+    def _record_change(self, tag: str, old: Any, new: Any) -> None:
+        change = self._changes.get(tag)
+        if change is not None:
+            old = change.old
+        if old == new:
+            del self._changes[tag]
         else:
-            deleter()
+            self._changes[tag] = Change(old=None if old is MISSING else old, new=new)
+
+    def _index_raw_tags(self) -> Mapping[str, Any] | None:
+        return None
+
+    def _invalidate_raw(self, key: str) -> None:
+        tag = self.__class__.TAGS.get(key)
+        if tag is not None:
+            self._values.pop(tag, None)
 
     @abstractmethod
     def _get_tag(self, name: str, default: Any = MISSING) -> Any:
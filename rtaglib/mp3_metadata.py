@@ -1,8 +1,16 @@
 from functools import partial
-from mutagen.id3 import TALB, TIT2, TPE2, TPOS, TRCK, TXXX, TextFrame
+from mutagen._util import loadfile, read_full
+from mutagen.id3 import APIC, ID3, ID3FileType, TALB, TIT2, TPE2, TPOS, TRCK, TXXX, TextFrame
+from mutagen.id3._id3v1 import find_id3v1
+from mutagen.id3._tags import ID3Header
+from mutagen.id3._util import BitPaddedInt, ID3JunkFrameError, ID3NoHeaderError, ID3UnsupportedVersionError, is_valid_frame_id
+from mutagen.mp3 import HeaderNotFoundError, MP3
+from rtaglib.lazy import LazyFileType, LazyPayload
 from rtaglib.metadata import \
     ALBUM_TITLE_ATTR, \
     ARTIST_TITLE_ATTR, \
+    TRACK_DISC_ATTR, \
+    TRACK_NUMBER_ATTR, \
     TRACK_TITLE_ATTR, \
     MISSING, \
     MUSICBRAINZ_ALBUM_ID_ATTR, \
@@ -13,7 +21,12 @@ from rtaglib.metadata import \
     RCOOK_TRACK_ID_ATTR, \
     Metadata
 from rtaglib.pos import Pos
-from typing import Any, Protocol, Sequence, Tuple
+from rtaglib.registry import _is_mpeg_sync
+from typing import Any, Iterator, Protocol, Sequence, Tuple, cast
+import struct
+
+
+APIC_HEAD_SIZE = 4096
 
 
 class TagCtor(Protocol):
@@ -21,6 +34,141 @@ class TagCtor(Protocol):
         raise NotImplementedError()
 
 
+class TagsOnlyMP3Info(ID3FileType._Info):
+    def __init__(self, fileobj: Any, offset: int | None) -> None:
+        if offset is None:
+            fileobj.seek(0)
+            if not _is_mpeg_sync(fileobj.read(2)):
+                raise HeaderNotFoundError("can't sync to MPEG frame")
+
+
+class TagsOnlyMP3(MP3):
+    _Info = TagsOnlyMP3Info
+
+
+class LazyID3(ID3):
+    @loadfile()
+    def load(self, filething: Any, known_frames: Any = None, translate: bool = True, v2_version: int = 4, load_v1: bool = True) -> None:
+        fileobj = filething.fileobj
+        start = fileobj.tell()
+        try:
+            header = ID3Header(fileobj)
+        except (ID3NoHeaderError, ID3UnsupportedVersionError):
+            header = None
+
+        frames = None
+        if header is not None and header.version >= ID3Header._V23 and not header.f_unsynch and not header.f_extended:
+            if known_frames is not None:
+                header._known_frames = known_frames
+            frames = self.__class__._read_frames_lazy(header, fileobj)
+
+        if frames is None:
+            fileobj.seek(start)
+            super().load(
+                filething,
+                known_frames=known_frames,
+                translate=translate,
+                v2_version=v2_version,
+                load_v1=load_v1)
+            return
+
+        data, pictures, padding = frames
+        self.unknown_frames = []
+        self._header = header
+        self._read(header, data)
+        self._padding = padding
+        for picture in pictures:
+            self._add(picture, False)
+
+        if load_v1:
+            v1_frames, _ = find_id3v1(fileobj, 4 if self.version[1] == 4 else 3, known_frames)
+            for v in (v1_frames or {}).values():
+                if len(self.getall(v.HashKey)) == 0:
+                    self.add(v)
+
+        if translate:
+            if v2_version == 3:
+                self.update_to_v23()
+            else:
+                self.update_to_v24()
+
+    def _write(self, config: Any) -> bytes:
+        pictures = [
+            (picture, picture.data)
+            for picture in self.getall(APIC.__name__)
+            if isinstance(picture.data, LazyPayload)
+        ]
+        for picture, payload in pictures:
+            picture._setattr("data", payload.read())
+        try:
+            return super()._write(config)
+        finally:
+            for picture, payload in pictures:
+                picture._setattr("data", payload)
+
+    @staticmethod
+    def _read_frames_lazy(header: Any, fileobj: Any) -> Tuple[bytes, list[APIC], int] | None:
+        is_v24 = header.version >= ID3Header._V24
+        end = fileobj.tell() + header.size - 10
+        data = bytearray()
+        pictures = []
+        while True:
+            frame_start = fileobj.tell()
+            if frame_start + 10 > end:
+                break
+            frame_header = fileobj.read(10)
+            name, size_bytes, flags = struct.unpack(">4s4sH", frame_header)
+            if name.strip(b"\x00") == b"":
+                break
+            if is_v24 and any(b & 0x80 for b in size_bytes):
+                return None
+            size = BitPaddedInt(size_bytes, bits=7 if is_v24 else 8)
+            if not is_valid_frame_id(name.decode("latin-1")) or frame_start + 10 + size > end:
+                return None
+
+            if name == b"APIC" and flags == 0 and size > APIC_HEAD_SIZE:
+                picture = LazyID3._read_apic_lazy(header, fileobj, size)
+                if picture is not None:
+                    pictures.append(picture)
+                    continue
+                fileobj.seek(frame_start + 10)
+            data += frame_header
+            data += cast(bytes, read_full(fileobj, size))
+
+        fileobj.seek(end)
+        return bytes(data), pictures, end - frame_start
+
+    @staticmethod
+    def _read_apic_lazy(header: Any, fileobj: Any, size: int) -> APIC | None:
+        offset = fileobj.tell()
+        head = cast(bytes, read_full(fileobj, APIC_HEAD_SIZE))
+        try:
+            picture = APIC._fromData(header, 0, head)
+        except ID3JunkFrameError:
+            return None
+        if not picture.data:
+            return None
+
+        prefix = len(head) - len(picture.data)
+        picture._setattr("data", LazyPayload(offset=offset + prefix, length=size - prefix))
+        fileobj.seek(offset + size)
+        return picture
+
+
+class LazyMP3(LazyFileType, MP3):
+    ID3 = LazyID3
+
+    def _payloads(self) -> Iterator[LazyPayload]:
+        if self.tags is not None:
+            for picture in self.tags.getall(APIC.__name__):
+                if isinstance(picture.data, LazyPayload):
+                    yield picture.data
+
+
+class LazyTagsOnlyMP3(LazyMP3):
+    _Info = TagsOnlyMP3Info
+
+
 class MP3Metadata(Metadata):
     MAPPINGS: Sequence[Tuple[str, str, type[TextFrame], TagCtor]] = [
         (tag, tag_type.__name__, tag_type, partial(tag_type, encoding=3))
@@ -49,7 +197,16 @@ class MP3Metadata(Metadata):
         tag: (key, tag_type, tag_ctor)
         for tag, key, tag_type, tag_ctor in MAPPINGS
     }
-    TAGS: dict[str, str] = {key: tag for tag, key, _, _ in MAPPINGS}
+    TAGS: dict[str, str] = {key: tag for tag, key, _, _ in MAPPINGS} | {
+        TPOS.__name__: TRACK_DISC_ATTR,
+        TRCK.__name__: TRACK_NUMBER_ATTR,
+    }
+    FILE_TYPES: dict[Tuple[bool, bool], type] = {
+        (False, False): MP3,
+        (True, False): TagsOnlyMP3,
+        (False, True): LazyMP3,
+        (True, True): LazyTagsOnlyMP3,
+    }
 
     def _get_tag(self, tag: str, default: Any = MISSING) -> Any:
         key, tag_type, _ = self.__class__.KEYS[tag]
@@ -92,23 +249,28 @@ class MP3Metadata(Metadata):
             if item is None:
                 return default
 
-        assert isinstance(item, tag_type)
+        if not isinstance(item, tag_type):
+            raise ValueError(f"Expected a {tag_type.__name__} frame for {key}")
 
         values = item.text  # type: ignore
-        assert isinstance(values, list) and len(values) == 1
+        if not isinstance(values, list) or len(values) != 1:
+            raise ValueError(f"Expected a single value for {key}")
 
         value = values[0]
-        assert isinstance(value, str)
+        if not isinstance(value, str):
+            raise ValueError(f"Expected a string value for {key}")
 
         return value
 
     def _set_raw(self, key: str, tag_ctor: TagCtor, value: Any) -> None:
+        self._invalidate_raw(key)
         if self._m.tags is None:
             self._m.add_tags()
             assert self._m.tags is not None
         self._m.tags[key] = tag_ctor(text=value)
 
     def _del_raw(self, key: str) -> None:
+        self._invalidate_raw(key)
         if self._m.tags is not None:
             try:
                 del self._m.tags[key]
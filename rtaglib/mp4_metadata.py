@@ -1,6 +1,12 @@
+from mutagen._util import DictProxy, loadfile
+from mutagen.mp4 import MP4, MP4Info, MP4StreamInfoError, MP4Tags, error
+from mutagen.mp4._atom import Atom, AtomError, Atoms
+from rtaglib.lazy import LazyFileType, LazyPayload
 from rtaglib.metadata import \
     ALBUM_TITLE_ATTR, \
     ARTIST_TITLE_ATTR, \
+    TRACK_DISC_ATTR, \
+    TRACK_NUMBER_ATTR, \
     TRACK_TITLE_ATTR, \
     MISSING, \
     MUSICBRAINZ_ALBUM_ID_ATTR, \
@@ -11,20 +17,89 @@ from rtaglib.metadata import \
     RCOOK_TRACK_ID_ATTR, \
     Metadata
 from rtaglib.pos import Pos
-from typing import Any, Sequence, Tuple
+from typing import Any, Iterator, Sequence, Tuple
 
 
 FREEFORM_PREFIX = "----:"
+LAZY_ATOMS: Sequence[bytes] = [b"covr"]
+HEADER_ATOMS: Sequence[bytes] = [b"ftyp", b"moov"]
+
+
+class TagsOnlyMP4(MP4):
+    @loadfile()
+    def load(self, filething: Any) -> None:
+        fileobj = filething.fileobj
+
+        try:
+            atoms = Atoms(fileobj)
+        except AtomError as err:
+            raise error(err) from err
+        if not any(name in atoms for name in HEADER_ATOMS):
+            raise MP4StreamInfoError("not a MP4 file")
+
+        self.info = MP4Info()  # type: ignore[assignment]
+        self.chapters = None
+        if MP4Tags._can_load(atoms):
+            self.tags = self.MP4Tags(atoms, fileobj)  # type: ignore[assignment]
+        else:
+            self.tags = None
+
+
+class LazyMP4Tags(MP4Tags):
+    def load(self, atoms: Any, fileobj: Any) -> None:
+        try:
+            ilst = atoms.path(b"moov", b"udta", b"meta", b"ilst")[-1]
+        except KeyError:
+            super().load(atoms, fileobj)
+            return
+
+        children = ilst.children
+        ilst.children = [atom for atom in children if atom.name not in LAZY_ATOMS]
+        try:
+            super().load(atoms, fileobj)
+        finally:
+            ilst.children = children
+
+        for atom in children:
+            if atom.name in LAZY_ATOMS:
+                key = atom.name.decode("latin-1")
+                payloads = self.get(key, []) + [LazyPayload(offset=atom._dataoffset, length=atom.datalength)]
+                DictProxy.__setitem__(self, key, payloads)
+
+    def _render(self, key: str, value: Any) -> bytes:
+        if isinstance(value, list) and value and all(isinstance(v, LazyPayload) for v in value):
+            name = key.encode("latin-1")
+            return b"".join(Atom.render(name, payload.read()) for payload in value)
+        return super()._render(key, value)
+
+
+class LazyMP4(LazyFileType, MP4):
+    MP4Tags = LazyMP4Tags
+
+    def _payloads(self) -> Iterator[LazyPayload]:
+        if self.tags is not None:
+            for key in LAZY_ATOMS:
+                for value in self.tags.get(key.decode("latin-1"), []):
+                    if isinstance(value, LazyPayload):
+                        yield value
+
+
+class LazyTagsOnlyMP4(LazyMP4, TagsOnlyMP4):
+    pass
 
 
 class MP4Metadata(Metadata):
     MAPPINGS: Sequence[Tuple[str, str]] = [
         (ARTIST_TITLE_ATTR, "aART"),
         (ALBUM_TITLE_ATTR, "\xa9alb"),
-        (TRACK_TITLE_ATTR, "\xa9nam"),
-        (MUSICBRAINZ_ARTIST_ID_ATTR, "musicbrainz_artistid"),
-        (MUSICBRAINZ_ALBUM_ID_ATTR, "musicbrainz_albumid"),
-        (MUSICBRAINZ_TRACK_ID_ATTR, "musicbrainz_trackid")
+        (TRACK_TITLE_ATTR, "\xa9nam")
+    ] + [
+        (tag,  f"{FREEFORM_PREFIX}com.apple.iTunes:{label}")
+        for tag, label in [
+            (MUSICBRAINZ_ARTIST_ID_ATTR, "MusicBrainz Artist Id"),
+            (MUSICBRAINZ_ALBUM_ID_ATTR, "MusicBrainz Album Id"),
+            (MUSICBRAINZ_TRACK_ID_ATTR, "MusicBrainz Track Id"),
+        ]
     ] + [
         (tag,  f"{FREEFORM_PREFIX}org.rcook:{label}")
         for tag, label in [
@@ -34,7 +109,16 @@ class MP4Metadata(Metadata):
         ]
     ]
     KEYS: dict[str, str] = {tag: key for tag, key in MAPPINGS}
-    TAGS: dict[str, str] = {key: tag for tag, key in MAPPINGS}
+    TAGS: dict[str, str] = {key: tag for tag, key in MAPPINGS} | {
+        "disk": TRACK_DISC_ATTR,
+        "trkn": TRACK_NUMBER_ATTR,
+    }
+    FILE_TYPES: dict[Tuple[bool, bool], type] = {
+        (False, False): MP4,
+        (True, False): TagsOnlyMP4,
+        (False, True): LazyMP4,
+        (True, True): LazyTagsOnlyMP4,
+    }
 
     def _get_tag(self, tag: str, default: Any = MISSING) -> Any:
         return self._get_raw(self.__class__.KEYS[tag], default=default)
@@ -49,7 +133,7 @@ class MP4Metadata(Metadata):
         return self._get_pos("disk", default=default)
 
     def _set_track_disc(self, value: Pos) -> None:
-        self._set_raw("disk", (value.index, value.total))
+        self._set_raw("disk", (value.index, value.total or 0))
 
     def _del_track_disc(self) -> None:
         self._del_raw("disk")
@@ -58,20 +142,25 @@ class MP4Metadata(Metadata):
         return self._get_pos("trkn", default=default)
 
     def _set_track_number(self, value: Pos) -> None:
-        self._set_raw("trkn", (value.index, value.total))
+        self._set_raw("trkn", (value.index, value.total or 0))
 
     def _del_track_number(self) -> None:
         self._del_raw("trkn")
 
     def _get_raw(self, key: str, default: Any = MISSING) -> Any:
         if default is MISSING:
+            if self._m.tags is None:
+                raise KeyError(key)
             items = self._m.tags[key]
         else:
+            if self._m.tags is None:
+                return default
             items = self._m.tags.get(key)
             if items is None:
                 return default
 
-        assert isinstance(items, list) and len(items) == 1
+        if not isinstance(items, list) or len(items) != 1:
+            raise ValueError(f"Expected a single value for {key}")
 
         item = items[0]
         if isinstance(item, str):
@@ -81,11 +170,13 @@ class MP4Metadata(Metadata):
             return item
 
         value = item.decode()
-        assert isinstance(value, str)
+        if not isinstance(value, str):
+            raise ValueError(f"Expected a string value for {key}")
 
         return value
 
     def _set_raw(self, key: str, value: Any) -> None:
+        self._invalidate_raw(key)
         if key.startswith(FREEFORM_PREFIX):
             data = value.encode("utf-8")
         else:
@@ -96,10 +187,12 @@ class MP4Metadata(Metadata):
         self._m.tags[key] = [data]
 
     def _del_raw(self, key: str) -> None:
-        try:
-            del self._m.tags[key]
-        except KeyError:
-            pass
+        self._invalidate_raw(key)
+        if self._m.tags is not None:
+            try:
+                del self._m.tags[key]
+            except KeyError:
+                pass
 
     def _get_pos(self, key: str, default: Any = MISSING) -> Any:
         value = self._get_raw(
@@ -107,5 +200,5 @@ class MP4Metadata(Metadata):
             default=default if default is MISSING else None)
         match value:
             case None: return default
-            case (int(index), int(total)): return Pos(index=index, total=total)
+            case (int(index), int(total)): return Pos(index=index, total=total or None)
             case _: raise NotImplementedError()
@@ -0,0 +1,40 @@
+from dataclasses import dataclass
+from typing import Any, Callable
+
+
+PaddingFunction = Callable[[Any], int]
+
+
+@dataclass(frozen=True)
+class SaveResult:
+    written: bool
+    in_place: bool
+    bytes_moved: int
+    size_delta: int = 0
+
+
+@dataclass(frozen=True)
+class PaddingPolicy:
+    grow: int = 4096
+    max_padding: int | None = None
+
+    def __call__(self, info: Any) -> int:
+        if info.padding >= 0 and (self.max_padding is None or info.padding <= self.max_padding):
+            return info.padding
+        return self.grow
+
+
+class PaddingRecorder:
+    def __init__(self, padding: PaddingFunction | None) -> None:
+        self._padding = padding
+        self.result = SaveResult(written=True, in_place=True, bytes_moved=0)
+
+    def __call__(self, info: Any) -> int:
+        padding = info.get_default_padding() if self._padding is None else self._padding(info)
+        in_place = padding == info.padding
+        self.result = SaveResult(
+            written=True,
+            in_place=in_place,
+            bytes_moved=0 if in_place else info.size,
+            size_delta=padding - info.padding)
+        return padding
@@ -1,28 +1,80 @@
-from dataclasses import dataclass
-from functools import cache
 from typing import Any, Optional, Self
 
 
-@dataclass(frozen=True)
+MAX_INTERNED = 99
+
+
 class Pos:
+    __slots__ = ("index", "total")
+    __match_args__ = ("index", "total")
+
     index: Optional[int]
     total: Optional[int]
 
+    def __new__(cls, index: Optional[int], total: Optional[int]) -> Self:
+        if cls is Pos and type(index) is int and 0 < index <= MAX_INTERNED:
+            if total is None:
+                row = _INTERNED[0]
+            elif type(total) is int and index <= total <= MAX_INTERNED:
+                row = _INTERNED[total]
+            else:
+                return cls._make(index, total)
+            pos = row[index]
+            if pos is None:
+                pos = row[index] = cls._make(index, total)
+                _PARSED[str(pos)] = pos
+            return pos  # type: ignore
+        return cls._make(index, total)
+
+    @classmethod
+    def _make(cls, index: Optional[int], total: Optional[int]) -> Self:
+        pos = object.__new__(cls)
+        object.__setattr__(pos, "index", index)
+        object.__setattr__(pos, "total", total)
+        return pos
+
     @classmethod
     def check(cls, obj: Any) -> Self:
-        assert isinstance(obj, cls)
+        if not isinstance(obj, cls):
+            raise ValueError(f"Value {obj} is not of required type {cls.__name__}")
         return obj
 
     @classmethod
     def parse(cls, s: str) -> Self:
+        pos = _PARSED.get(s)
+        if pos is not None and cls is Pos:
+            return pos  # type: ignore
         match s.split("/", maxsplit=1):
             case [index_str]: return cls(index=int(index_str), total=None)
             case [index_str, total_str]: return cls(index=int(index_str), total=int(total_str))
             case _: raise NotImplementedError()
 
-    @cache
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"cannot assign to field '{name}'")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"cannot delete field '{name}'")
+
+    def __reduce__(self) -> tuple[type, tuple[Optional[int], Optional[int]]]:
+        return self.__class__, (self.index, self.total)
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.index == other.index and self.total == other.total  # type: ignore
+
+    def __hash__(self) -> int:
+        return hash((self.index, self.total))
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(index={self.index!r}, total={self.total!r})"
+
     def __str__(self) -> str:
         if self.total is None:
             return str(self.index)
         else:
             return f"{self.index}/{self.total}"
+
+
+_INTERNED: list[list[Pos | None]] = [[None] * (MAX_INTERNED + 1) for _ in range(MAX_INTERNED + 1)]
+_PARSED: dict[str, Pos] = {}
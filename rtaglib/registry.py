@@ -0,0 +1,94 @@
+from functools import cache
+from importlib import import_module
+from pathlib import Path
+from typing import Any, Callable, NamedTuple, Sequence, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from rtaglib.metadata import Metadata
+
+
+ASF_HEADER_GUID = bytes.fromhex("3026B2758E66CF11A6D900AA0062CE6C")
+HEADER_SIZE = 16
+
+Sniffer = Callable[[bytes, bool], bool]
+
+
+def _id3_size(header: bytes) -> int:
+    size = 10 + sum((b & 0x7F) << (7 * (3 - i)) for i, b in enumerate(header[6:10]))
+    return size + 10 if header[5] & 0x10 else size
+
+
+def _is_mpeg_sync(header: bytes) -> bool:
+    return len(header) >= 2 and header[0] == 0xFF and header[1] & 0xE0 == 0xE0 and header[1] & 0x06 != 0
+
+
+def sniff_flac(header: bytes, id3: bool) -> bool:
+    return header[:4] == b"fLaC"
+
+
+def sniff_mp3(header: bytes, id3: bool) -> bool:
+    return id3 or _is_mpeg_sync(header)
+
+
+def sniff_mp4(header: bytes, id3: bool) -> bool:
+    return not id3 and header[4:8] == b"ftyp"
+
+
+def sniff_asf(header: bytes, id3: bool) -> bool:
+    return not id3 and header == ASF_HEADER_GUID
+
+
+class Format(NamedTuple):
+    name: str
+    target: "str | type[Metadata]"
+    sniff: Sniffer
+    extensions: Sequence[str]
+
+
+_FORMATS: list[Format] = []
+
+
+def register(name: str, target: "str | type[Metadata]", sniff: Sniffer, extensions: Sequence[str] = ()) -> None:
+    _FORMATS[:] = [f for f in _FORMATS if f.name != name]
+    _FORMATS.append(Format(
+        name=name,
+        target=target,
+        sniff=sniff,
+        extensions=[ext.lower() for ext in extensions]))
+
+
+def formats() -> Sequence[Format]:
+    return list(_FORMATS)
+
+
+def detect(f: Any, path: Path) -> "type[Metadata] | None":
+    f.seek(0)
+    header = f.read(HEADER_SIZE)
+    id3 = len(header) >= 10 and header[:3] == b"ID3"
+    if id3:
+        f.seek(_id3_size(header))
+        header = f.read(HEADER_SIZE)
+    f.seek(0)
+
+    ext = path.suffix.lower()
+    candidates = sorted(reversed(_FORMATS), key=lambda format: ext not in format.extensions)
+    for format in candidates:
+        if format.sniff(header, id3):
+            return _load_target(format.target)
+    return None
+
+
+def _load_target(target: "str | type[Metadata]") -> "type[Metadata]":
+    return _import(target) if isinstance(target, str) else target
+
+
+@cache
+def _import(target: str) -> "type[Metadata]":
+    module_name, _, attr = target.partition(":")
+    return getattr(import_module(module_name), attr)
+
+
+register("mp3", "rtaglib.mp3_metadata:MP3Metadata", sniff_mp3, [".mp3", ".mp2"])
+register("flac", "rtaglib.flac_metadata:FLACMetadata", sniff_flac, [".flac"])
+register("mp4", "rtaglib.mp4_metadata:MP4Metadata", sniff_mp4, [".m4a", ".m4b", ".m4p", ".mp4"])
+register("asf", "rtaglib.wma_metadata:WMAMetadata", sniff_asf, [".wma", ".asf", ".wmv"])
@@ -0,0 +1,78 @@
+from contextvars import copy_context
+from concurrent.futures import Executor, FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from functools import partial
+from os import cpu_count, fsencode, walk as os_walk
+from pathlib import Path
+from rtaglib.metadata import Metadata
+from typing import Callable, Iterable, Iterator, Tuple, TypeVar
+import zlib
+
+
+T = TypeVar("T")
+
+ScanResult = Tuple[Path, Metadata | Exception]
+Shard = Tuple[int, int]
+
+
+def shard_of(path: Path, root: Path, count: int) -> int:
+    return zlib.crc32(fsencode(path.relative_to(root).as_posix())) % count
+
+
+def check_shard(shard: Shard) -> Shard:
+    index, count = shard
+    if not 0 <= index < count:
+        raise ValueError(f"Invalid shard {index}/{count}")
+    return shard
+
+
+def walk(root: Path, shard: Shard | None = None) -> Iterator[Path]:
+    if shard is not None:
+        index, count = check_shard(shard)
+    for dir_path, dir_names, file_names in os_walk(root):
+        dir_names.sort()
+        for file_name in sorted(file_names):
+            path = Path(dir_path) / file_name
+            if shard is None or shard_of(path, root, count) == index:
+                yield path
+
+
+def load(path: Path, tags_only: bool = False, lazy: bool = False) -> Metadata | Exception:
+    try:
+        return Metadata.load(path, tags_only=tags_only, lazy=lazy)
+    except Exception as e:
+        return e
+
+
+def map_paths(paths: Iterable[Path], f: Callable[[Path], T], workers: int | None = None, processes: bool = False) -> Iterator[Tuple[Path, T]]:
+    workers = workers or cpu_count() or 1
+    executor: Executor = \
+        ProcessPoolExecutor(max_workers=workers) if processes \
+        else ThreadPoolExecutor(max_workers=workers)
+    max_pending = workers * 4
+    pending: dict[Future, Path] = {}
+    try:
+        for path in paths:
+            if processes:
+                future = executor.submit(f, path)
+            else:
+                future = executor.submit(copy_context().run, f, path)
+            pending[future] = path
+            if len(pending) >= max_pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future.result()
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future.result()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def scan_paths(paths: Iterable[Path], workers: int | None = None, processes: bool = False, tags_only: bool = False, lazy: bool = False) -> Iterator[ScanResult]:
+    return map_paths(paths, partial(load, tags_only=tags_only, lazy=lazy), workers=workers, processes=processes)
+
+
+def scan(root: Path, workers: int | None = None, processes: bool = False, tags_only: bool = False, lazy: bool = False, shard: Shard | None = None) -> Iterator[ScanResult]:
+    return scan_paths(walk(root, shard=shard), workers=workers, processes=processes, tags_only=tags_only, lazy=lazy)
@@ -0,0 +1,88 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from typing import Any, BinaryIO, Iterator, Protocol
+
+
+class Collector(Protocol):
+    def timing(self, phase: str, format: str, seconds: float) -> None:
+        raise NotImplementedError()
+
+    def count(self, counter: str, format: str, n: int = 1) -> None:
+        raise NotImplementedError()
+
+
+class Stats:
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.timings: dict[tuple[str, str], list[float]] = {}
+        self.counters: dict[tuple[str, str], int] = {}
+
+    def timing(self, phase: str, format: str, seconds: float) -> None:
+        with self._lock:
+            t = self.timings.setdefault((phase, format), [0, 0.0])
+            t[0] += 1
+            t[1] += seconds
+
+    def count(self, counter: str, format: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[(counter, format)] = self.counters.get((counter, format), 0) + n
+
+    def report(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            report: dict[str, dict[str, Any]] = {}
+            for (phase, format), (count, total) in sorted(self.timings.items()):
+                report.setdefault(format, {})[phase] = {"count": count, "seconds": total}
+            for (counter, format), n in sorted(self.counters.items()):
+                report.setdefault(format, {})[counter] = n
+            return report
+
+
+class CountingFile:
+    def __init__(self, f: BinaryIO) -> None:
+        self._f = f
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+    @property
+    def name(self) -> str:
+        return self._f.name
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._f.read(size)
+        self.bytes_read += len(data)
+        return data
+
+    def write(self, data: bytes) -> int:
+        n = self._f.write(data)
+        self.bytes_written += n
+        return n
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        return self._f.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._f.tell()
+
+    def truncate(self, size: int | None = None) -> int:
+        return self._f.truncate(size)
+
+    def flush(self) -> None:
+        self._f.flush()
+
+
+_collector: ContextVar[Collector | None] = ContextVar("rtaglib_collector", default=None)
+
+
+def current_collector() -> Collector | None:
+    return _collector.get()
+
+
+@contextmanager
+def collect(collector: Collector | None = None) -> Iterator[Collector]:
+    c: Collector = Stats() if collector is None else collector
+    token = _collector.set(c)
+    try:
+        yield c
+    finally:
+        _collector.reset(token)
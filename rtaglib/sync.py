@@ -0,0 +1,131 @@
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from rtaglib.metadata import \
+    MUSICBRAINZ_TRACK_ID_ATTR, \
+    RCOOK_TRACK_ID_ATTR, \
+    Change, \
+    Metadata, \
+    MetadataMeta, \
+    Snapshot
+from rtaglib.scan import map_paths
+from typing import Any, Iterable, Iterator, Mapping, Sequence, Tuple, TYPE_CHECKING
+from uuid import UUID
+
+if TYPE_CHECKING:
+    from rtaglib.index import TagIndex
+
+
+SYNC_TAGS: Sequence[str] = [tag for tag, _, _ in MetadataMeta._TAGS]
+KEY_TAGS: Sequence[str] = [RCOOK_TRACK_ID_ATTR, MUSICBRAINZ_TRACK_ID_ATTR]
+
+Values = Mapping[str, Any]
+Keys = Mapping[Tuple[str, UUID], Path | None]
+
+
+@dataclass(frozen=True)
+class SyncResult:
+    master: Path
+    changes: Mapping[str, Change]
+    written: bool
+
+
+def sync(masters: Iterable[Path], derivatives: Iterable[Path], tags: Sequence[str] = SYNC_TAGS, workers: int | None = None, index: "TagIndex | None" = None, dry_run: bool = False) -> Iterator[Tuple[Path, SyncResult | Exception]]:
+    for tag in tags:
+        if tag not in MetadataMeta._TO_TAG_INFOS:
+            raise ValueError(f"Unknown tag {tag}")
+
+    master_values: dict[Path, Values] = {}
+    keys: dict[Tuple[str, UUID], Path | None] = {}
+    for path, values in _read_all(masters, workers=workers, index=index):
+        if isinstance(values, Exception):
+            yield path, values
+            continue
+        master_values[path] = values
+        for tag in KEY_TAGS:
+            value = values.get(tag)
+            if value is not None:
+                key = (tag, value)
+                keys[key] = None if key in keys else path
+
+    pending = []
+    for path in derivatives:
+        derivative_values = None if index is None else index.get(path, fresh=True)
+        if derivative_values is None:
+            pending.append(path)
+            continue
+        try:
+            master = _match(derivative_values, keys)
+        except ValueError as e:
+            yield path, e
+            continue
+        if master is None or master == path:
+            continue
+        if any(derivative_values.get(tag) != master_values[master].get(tag) for tag in tags):
+            pending.append(path)
+        else:
+            yield path, SyncResult(master=master, changes={}, written=False)
+
+    f = partial(_sync, master_values=master_values, keys=keys, tags=tags, dry_run=dry_run)
+    for path, outcome in map_paths(pending, f, workers=workers):
+        if outcome is None:
+            continue
+        if isinstance(outcome, Exception):
+            yield path, outcome
+            continue
+        result, m = outcome
+        if index is not None and result.written:
+            index.update(path=path, metadata=m)
+        yield path, result
+
+
+def _read_all(paths: Iterable[Path], workers: int | None, index: "TagIndex | None") -> Iterator[Tuple[Path, Values | Exception]]:
+    to_load = []
+    for path in paths:
+        values = None if index is None else index.get(path, fresh=True)
+        if values is None:
+            to_load.append(path)
+        else:
+            yield path, values
+    yield from map_paths(to_load, _read, workers=workers)
+
+
+def _read(path: Path) -> Values | Exception:
+    try:
+        snapshot = Metadata.load(path, tags_only=True, lazy=True).snapshot()
+    except Exception as e:
+        return e
+    return {tag: value for tag, value in zip(Snapshot._fields, snapshot) if value is not None}
+
+
+def _match(values: Values, keys: Keys) -> Path | None:
+    for tag in KEY_TAGS:
+        value = values.get(tag)
+        if value is not None and (tag, value) in keys:
+            master = keys[(tag, value)]
+            if master is None:
+                raise ValueError(f"Multiple masters have {tag} {value}")
+            return master
+    return None
+
+
+def _sync(path: Path, master_values: Mapping[Path, Values], keys: Keys, tags: Sequence[str], dry_run: bool) -> Tuple[SyncResult, Metadata] | Exception | None:
+    try:
+        m = Metadata.load(path, tags_only=True, lazy=True)
+        master = _match({tag: m.get_tag(tag, default=None) for tag in KEY_TAGS}, keys)
+        if master is None or master == path:
+            return None
+
+        values = master_values[master]
+        for tag in tags:
+            value = values.get(tag)
+            if value is None:
+                m.del_tag(tag)
+            else:
+                m.set_tag(tag, value)
+
+        changes = m.changes()
+        written = False if dry_run else m.save().written
+        return SyncResult(master=master, changes=changes, written=written), m
+    except Exception as e:
+        return e
@@ -0,0 +1,210 @@
+from ctypes import CDLL, c_char_p, c_int, c_uint32, get_errno
+from os import O_CLOEXEC, O_NONBLOCK, close, fsencode, read, strerror, walk as os_walk
+from pathlib import Path
+from rtaglib.metadata import Metadata
+from rtaglib.scan import scan_paths
+from select import select
+from threading import Event
+from time import monotonic
+from typing import Any, Callable, Iterator, Protocol
+import struct
+
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_ONLYDIR
+EVENT_HEADER = struct.Struct("iIII")
+
+WatchCallback = Callable[[Path, Metadata | Exception | None], None]
+
+
+class WatchIndex(Protocol):
+    def update(self, path: Path, metadata: Metadata | Exception) -> None:
+        raise NotImplementedError()
+
+    def remove(self, path: Path) -> None:
+        raise NotImplementedError()
+
+
+def _libc() -> Any:
+    libc = CDLL(None, use_errno=True)
+    if not hasattr(libc, "inotify_init1"):
+        raise NotImplementedError("inotify is not available on this platform")
+    libc.inotify_init1.argtypes = [c_int]
+    libc.inotify_add_watch.argtypes = [c_int, c_char_p, c_uint32]
+    libc.inotify_rm_watch.argtypes = [c_int, c_int]
+    return libc
+
+
+def _check(result: int, what: str) -> int:
+    if result < 0:
+        errno = get_errno()
+        raise OSError(errno, f"{what}: {strerror(errno)}")
+    return result
+
+
+class Watcher:
+    def __init__(self, root: Path, callback: WatchCallback | None = None, index: WatchIndex | None = None, debounce: float = 1.0, workers: int | None = None, tags_only: bool = True, lazy: bool = True) -> None:
+        self._root = root.absolute()
+        self._callback = callback
+        self._index = index
+        self._debounce = debounce
+        self._workers = workers
+        self._tags_only = tags_only
+        self._lazy = lazy
+        self._libc = _libc()
+        self._fd = _check(self._libc.inotify_init1(O_NONBLOCK | O_CLOEXEC), "inotify_init1")
+        self._dirs: dict[int, Path] = {}
+        self._wds: dict[Path, int] = {}
+        self._files: set[Path] = set()
+        self._pending: dict[Path, float] = {}
+        for path in self._add_tree(self._root):
+            self._files.add(path)
+
+    def __enter__(self) -> "Watcher":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            close(self._fd)
+            self._fd = -1
+
+    def fileno(self) -> int:
+        return self._fd
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def run(self, stop: Event | None = None) -> None:
+        while stop is None or not stop.is_set():
+            self.poll(timeout=1.0)
+
+    def poll(self, timeout: float | None = None) -> int:
+        wait = timeout
+        if self._pending:
+            due = min(self._pending.values()) + self._debounce - monotonic()
+            wait = max(0.0, due if wait is None else min(wait, due))
+
+        ready, _, _ = select([self._fd], [], [], wait)
+        if ready:
+            self._read_events()
+        return self.flush()
+
+    def flush(self, force: bool = False) -> int:
+        now = monotonic()
+        due = [
+            path
+            for path, t in self._pending.items()
+            if force or now - t >= self._debounce
+        ]
+        for path in due:
+            del self._pending[path]
+
+        loads = sorted(path for path in due if path.is_file())
+        for path in sorted(set(due).difference(loads)):
+            if path in self._files:
+                self._files.discard(path)
+                self._push(path, None)
+
+        for path, metadata in scan_paths(loads, workers=self._workers, tags_only=self._tags_only, lazy=self._lazy):
+            self._files.add(path)
+            self._push(path, metadata)
+
+        return len(due)
+
+    def _push(self, path: Path, metadata: Metadata | Exception | None) -> None:
+        if self._index is not None:
+            if metadata is None:
+                self._index.remove(path)
+            else:
+                try:
+                    self._index.update(path, metadata)
+                except FileNotFoundError:
+                    self._index.remove(path)
+        if self._callback is not None:
+            self._callback(path, metadata)
+
+    def _read_events(self) -> None:
+        try:
+            buffer = read(self._fd, 1 << 16)
+        except BlockingIOError:
+            return
+
+        now = monotonic()
+        offset = 0
+        while offset < len(buffer):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(buffer, offset)
+            offset += EVENT_HEADER.size
+            name = buffer[offset:offset + length].rstrip(b"\x00").decode(errors="surrogateescape")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                self._rescan(now)
+                continue
+
+            parent = self._dirs.get(wd)
+            if parent is None:
+                continue
+            if mask & IN_IGNORED:
+                self._forget(wd)
+                continue
+            if mask & IN_DELETE_SELF:
+                continue
+
+            path = parent / name
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    for file_path in self._add_tree(path):
+                        self._pending[file_path] = now
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    self._remove_tree(path, now)
+            else:
+                self._pending[path] = now
+
+    def _add_tree(self, root: Path) -> Iterator[Path]:
+        for dir_path, dir_names, file_names in os_walk(root):
+            dir_names.sort()
+            self._add_watch(Path(dir_path))
+            for file_name in sorted(file_names):
+                yield Path(dir_path) / file_name
+
+    def _add_watch(self, path: Path) -> None:
+        try:
+            wd = _check(self._libc.inotify_add_watch(self._fd, fsencode(path), WATCH_MASK), f"inotify_add_watch {path}")
+        except FileNotFoundError:
+            return
+        self._dirs[wd] = path
+        self._wds[path] = wd
+
+    def _forget(self, wd: int) -> None:
+        path = self._dirs.pop(wd, None)
+        if path is not None and self._wds.get(path) == wd:
+            del self._wds[path]
+
+    def _remove_tree(self, root: Path, now: float) -> None:
+        for path, wd in list(self._wds.items()):
+            if path.is_relative_to(root):
+                self._libc.inotify_rm_watch(self._fd, wd)
+                self._forget(wd)
+        for path in self._files:
+            if path.is_relative_to(root):
+                self._pending[path] = now
+
+    def _rescan(self, now: float) -> None:
+        for path in self._files:
+            self._pending[path] = now
+        for path in self._add_tree(self._root):
+            self._pending[path] = now
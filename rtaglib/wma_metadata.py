@@ -1,6 +1,9 @@
+from mutagen.asf import ASF
 from rtaglib.metadata import \
     ALBUM_TITLE_ATTR, \
     ARTIST_TITLE_ATTR, \
+    TRACK_DISC_ATTR, \
+    TRACK_NUMBER_ATTR, \
     TRACK_TITLE_ATTR, \
     MISSING, \
     MUSICBRAINZ_ALBUM_ID_ATTR, \
@@ -26,7 +29,17 @@ class WMAMetadata(Metadata):
         (RCOOK_TRACK_ID_ATTR, "org.rcook/TrackId")
     ]
     KEYS = {tag: key for tag, key in MAPPINGS}
-    TAGS = {key: tag for tag, key in MAPPINGS}
+    TAGS = {key: tag for tag, key in MAPPINGS} | {
+        "WM/PartOfSet": TRACK_DISC_ATTR,
+        "WM/Track": TRACK_NUMBER_ATTR,
+        "WM/TrackNumber": TRACK_NUMBER_ATTR,
+    }
+    FILE_TYPES = {
+        (False, False): ASF,
+        (True, False): ASF,
+        (False, True): ASF,
+        (True, True): ASF,
+    }
 
     def _get_tag(self, tag, default=MISSING):
         return self._get_raw(key=self.__class__.KEYS[tag], default=default)
@@ -57,28 +70,44 @@ class WMAMetadata(Metadata):
         self._del_raw(key="WM/Track")
         self._del_raw(key="WM/TrackNumber")
 
+    def _index_raw_tags(self):
+        index = {}
+        for key, value in self._m.tags:
+            index.setdefault(key, []).append(value)
+        return index
+
     def _get_raw(self, key, default=MISSING):
-        if default is MISSING:
+        if self._raw_index is not None:
+            items = self._raw_index.get(key)
+            if items is None:
+                if default is MISSING:
+                    raise KeyError(key)
+                return default
+        elif default is MISSING:
             items = self._m.tags[key]
         else:
             items = self._m.tags.get(key)
             if items is None:
                 return default
 
-        assert isinstance(items, list) and len(items) == 1
+        if not isinstance(items, list) or len(items) != 1:
+            raise ValueError(f"Expected a single value for {key}")
 
         item = items[0]
         value = item.value
         if isinstance(value, int):
             return value
-        else:
-            assert isinstance(value, str)
+        elif isinstance(value, str):
             return value
+        else:
+            raise ValueError(f"Expected a string value for {key}")
 
     def _set_raw(self, key, value):
+        self._invalidate_raw(key)
         self._m.tags[key] = value
 
     def _del_raw(self, key):
+        self._invalidate_raw(key)
         try:
             del self._m.tags[key]
         except KeyError:
@@ -0,0 +1,59 @@
+from pathlib import Path
+from typing import Callable
+import pytest
+import struct
+
+
+def _atom(name: bytes, data: bytes) -> bytes:
+    return struct.pack(">I4s", 8 + len(data), name) + data
+
+
+def _flac_block(code: int, data: bytes, last: bool = False) -> bytes:
+    return bytes([code | (0x80 if last else 0)]) + len(data).to_bytes(3, "big") + data
+
+
+def write_flac(path: Path, audio_size: int = 4096) -> None:
+    stream_info = \
+        struct.pack(">HH", 4096, 4096) + \
+        b"\0\0\0\0\0\0" + \
+        bytes([0x0A, 0xC4, 0x42, 0xF0]) + \
+        b"\0" * 20
+    vendor = b"rtaglib"
+    vorbis_comment = struct.pack("<I", len(vendor)) + vendor + struct.pack("<I", 0)
+    path.write_bytes(
+        b"fLaC" +
+        _flac_block(0, stream_info) +
+        _flac_block(4, vorbis_comment, last=True) +
+        b"\xff\xf8" + b"\0" * audio_size)
+
+
+def write_mp3(path: Path, audio_size: int = 4096) -> None:
+    frame = b"\xff\xfb\x90\x64" + b"\0" * 413
+    path.write_bytes(frame * max(1, audio_size // len(frame)))
+
+
+def write_mp4(path: Path, audio_size: int = 4096) -> None:
+    mvhd = _atom(b"mvhd", b"\0" * 12 + struct.pack(">II", 1000, 0) + b"\0" * 80)
+    path.write_bytes(
+        _atom(b"ftyp", b"M4A \0\0\0\0M4A mp42isom") +
+        _atom(b"moov", mvhd) +
+        _atom(b"mdat", b"\x01" * audio_size))
+
+
+WRITERS: dict[str, Callable[[Path], None]] = {
+    ".flac": write_flac,
+    ".mp3": write_mp3,
+    ".m4a": write_mp4,
+}
+
+MakeFile = Callable[[str], Path]
+
+
+@pytest.fixture
+def make_file(tmp_path: Path) -> MakeFile:
+    def make(name: str) -> Path:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        WRITERS[path.suffix](path)
+        return path
+    return make
@@ -0,0 +1,69 @@
+from pathlib import Path
+from rtaglib.index import TagIndex
+from rtaglib.metadata import TRACK_TITLE_ATTR, Metadata
+from typing import Callable, Sequence
+import subprocess
+import sys
+import zlib
+
+
+SHARDS = 4
+
+
+def make_library(make_file: Callable[[str], Path]) -> Sequence[Path]:
+    paths = [
+        make_file(f"library/album {album}/{track:02}{ext}")
+        for album in range(5)
+        for track, ext in enumerate([".flac", ".mp3", ".m4a"] * 3, start=1)
+    ]
+    for path in paths:
+        m = Metadata.load(path)
+        m.set_tag(TRACK_TITLE_ATTR, path.stem)
+        m.save()
+    return paths
+
+
+def expected_shard(path: Path, root: Path) -> int:
+    return zlib.crc32(path.relative_to(root).as_posix().encode()) % SHARDS
+
+
+def index_shards(root: Path, directory: Path) -> Sequence[Path]:
+    outputs = [directory / f"part-{i}.db" for i in range(SHARDS)]
+    processes = [
+        subprocess.Popen(
+            [sys.executable, "-m", "rtaglib.cli", "index", "-o", str(output), "--shard", f"{i}/{SHARDS}", str(root)],
+            stdout=subprocess.DEVNULL)
+        for i, output in enumerate(outputs)
+    ]
+    for process in processes:
+        assert process.wait() == 0
+    return outputs
+
+
+def test_sharded_index_merge(tmp_path: Path, make_file: Callable[[str], Path]) -> None:
+    paths = make_library(make_file)
+    root = tmp_path / "library"
+    (root / "notes.mp3").write_text("not audio")
+
+    outputs = index_shards(root, tmp_path)
+
+    for i, output in enumerate(outputs):
+        with TagIndex(output) as part:
+            indexed = [path for path, _ in part.entries()]
+            errors = [path for path, _ in part.errors()]
+        assert len(indexed) > 0
+        assert indexed == sorted(path for path in paths if expected_shard(path, root) == i)
+        assert all(expected_shard(path, root) == i for path in errors)
+
+    with TagIndex(tmp_path / "merged.db") as index:
+        results = [index.merge(output) for output in outputs]
+        assert sum(result.merged for result in results) == len(paths) + 1
+        assert all(result.skipped == 0 for result in results)
+
+        entries = dict(index.entries())
+        assert sorted(entries) == sorted(paths)
+        assert all(values[TRACK_TITLE_ATTR] == path.stem for path, values in entries.items())
+        assert [path for path, _ in index.errors()] == [root / "notes.mp3"]
+
+        results = [index.merge(output) for output in outputs]
+        assert sum(result.merged for result in results) == 0
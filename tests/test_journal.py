@@ -0,0 +1,114 @@
+from pathlib import Path
+from rtaglib import journal
+from rtaglib.journal import JournalError, WriteBatch
+from rtaglib.metadata import Metadata
+from typing import Any, Callable, Sequence
+import os
+import pytest
+
+
+class Crash(Exception):
+    pass
+
+
+def make_library(make_file: Callable[[str], Path]) -> Sequence[Path]:
+    paths = [make_file(name) for name in ["a.flac", "b.mp3", "c.m4a"]]
+    for path in paths:
+        m = Metadata.load(path)
+        m.track_title = "old"
+        m.save()
+    return paths
+
+
+def stage_all(journal_path: Path, paths: Sequence[Path]) -> WriteBatch:
+    batch = WriteBatch(journal_path)
+    for path in paths:
+        m = Metadata.load(path, lazy=True)
+        m.track_title = "new"
+        batch.stage(m)
+    return batch
+
+
+def titles(paths: Sequence[Path]) -> list[str]:
+    return [Metadata.load(path).track_title for path in paths]
+
+
+def leftovers(root: Path) -> list[str]:
+    return sorted(p.name for p in root.iterdir() if "rtaglib-" in p.name or p.name.startswith("journal"))
+
+
+def crash_on_replace(monkeypatch: pytest.MonkeyPatch, after: int) -> None:
+    replace: Callable[..., Any] = os.replace
+    count = 0
+
+    def crashing_replace(src: Any, dst: Any) -> None:
+        nonlocal count
+        if str(src).endswith(".rtaglib-tmp"):
+            if count == after:
+                raise Crash()
+            count += 1
+        replace(src, dst)
+
+    monkeypatch.setattr(journal.os, "replace", crashing_replace)
+
+
+def test_commit(tmp_path: Path, make_file: Callable[[str], Path]) -> None:
+    paths = make_library(make_file)
+    journal_path = tmp_path / "journal.json"
+
+    results = stage_all(journal_path, paths).commit()
+
+    assert all(result.written for result in results)
+    assert titles(paths) == ["new"] * len(paths)
+    assert leftovers(tmp_path) == []
+
+
+@pytest.mark.parametrize("roll_forward, expected", [(True, "new"), (False, "old")])
+def test_recover_interrupted_swap(tmp_path: Path, make_file: Callable[[str], Path], monkeypatch: pytest.MonkeyPatch, roll_forward: bool, expected: str) -> None:
+    paths = make_library(make_file)
+    journal_path = tmp_path / "journal.json"
+    crash_on_replace(monkeypatch, after=1)
+
+    with pytest.raises(Crash):
+        stage_all(journal_path, paths).commit()
+    monkeypatch.undo()
+
+    assert journal_path.exists()
+    assert titles(paths) == ["new", "old", "old"]
+    with pytest.raises(JournalError):
+        stage_all(journal_path, paths).commit()
+
+    WriteBatch.recover(journal_path, roll_forward=roll_forward)
+
+    assert titles(paths) == [expected] * len(paths)
+    assert leftovers(tmp_path) == []
+
+
+def test_recover_interrupted_prepare(tmp_path: Path, make_file: Callable[[str], Path], monkeypatch: pytest.MonkeyPatch) -> None:
+    paths = make_library(make_file)
+    journal_path = tmp_path / "journal.json"
+    prepare = WriteBatch._prepare
+    calls = 0
+
+    def crashing_prepare(metadata: Metadata, entry: dict[str, str]) -> Any:
+        nonlocal calls
+        calls += 1
+        if calls == 2:
+            raise Crash()
+        return prepare(metadata, entry)
+
+    monkeypatch.setattr(WriteBatch, "_prepare", staticmethod(crashing_prepare))
+
+    with pytest.raises(Crash):
+        stage_all(journal_path, paths).commit(workers=1)
+
+    assert titles(paths) == ["old"] * len(paths)
+    assert leftovers(tmp_path) == []
+
+
+def test_recover_without_journal(tmp_path: Path, make_file: Callable[[str], Path]) -> None:
+    paths = make_library(make_file)
+
+    WriteBatch.recover(tmp_path / "journal.json")
+
+    assert titles(paths) == ["old"] * len(paths)
@@ -0,0 +1,67 @@
+from functools import partial
+from mutagen.flac import FLAC, Picture
+from mutagen.id3 import APIC, ID3
+from mutagen.mp4 import MP4, MP4Cover
+from pathlib import Path
+from rtaglib.metadata import TRACK_TITLE_ATTR, Metadata
+from typing import Callable
+import pytest
+import shutil
+
+
+ARTWORK = [bytes(i & 0xFF for i in range(64 * 1024)), bytes(i % 251 for i in range(16 * 1024))]
+
+
+def add_id3_artwork(path: Path, v2_version: int) -> None:
+    tags = ID3()
+    for i, data in enumerate(ARTWORK):
+        tags.add(APIC(encoding=3, mime="image/jpeg", type=3 + i, desc=f"Cover {i}", data=data))
+    tags.save(path, v2_version=v2_version)
+
+
+def add_flac_artwork(path: Path) -> None:
+    m = FLAC(path)
+    for i, data in enumerate(ARTWORK):
+        picture = Picture()
+        picture.type = 3 + i
+        picture.mime = "image/jpeg"
+        picture.data = data
+        m.add_picture(picture)
+    m.save()
+
+
+def add_mp4_artwork(path: Path) -> None:
+    m = MP4(path)
+    m.add_tags()
+    assert m.tags is not None
+    m.tags["covr"] = [MP4Cover(data) for data in ARTWORK]
+    m.save()
+
+
+@pytest.mark.parametrize("name, add_artwork", [
+    ("a.mp3", partial(add_id3_artwork, v2_version=3)),
+    ("a.mp3", partial(add_id3_artwork, v2_version=4)),
+    ("a.flac", add_flac_artwork),
+    ("a.m4a", add_mp4_artwork),
+], ids=["id3v23", "id3v24", "flac", "mp4"])
+@pytest.mark.parametrize("title", ["Title", "Title" * 2000], ids=["in-place", "rewrite"])
+@pytest.mark.parametrize("tags_only", [False, True], ids=["full", "tags-only"])
+def test_lazy_save_matches_eager(tmp_path: Path, make_file: Callable[[str], Path], name: str, add_artwork: Callable[[Path], None], title: str, tags_only: bool) -> None:
+    source = make_file(name)
+    add_artwork(source)
+    eager_path = tmp_path / f"eager{source.suffix}"
+    lazy_path = tmp_path / f"lazy{source.suffix}"
+    shutil.copy(source, eager_path)
+    shutil.copy(source, lazy_path)
+
+    eager = Metadata.load(eager_path, tags_only=tags_only)
+    lazy = Metadata.load(lazy_path, tags_only=tags_only, lazy=True)
+    payloads = [payload.read() for payload in lazy._m._payloads()]
+    assert len(payloads) > 0
+
+    for m in [eager, lazy]:
+        m.set_tag(TRACK_TITLE_ATTR, title)
+        m.save()
+
+    assert lazy_path.read_bytes() == eager_path.read_bytes()
+    assert [payload.read() for payload in lazy._m._payloads()] == payloads